@@ -0,0 +1,20 @@
+import squat_logic as squat
+import pushup_logic as pushup
+
+# Exercises whose analyzers can be instantiated per stream.
+# The module-level process_* helpers share one global analyzer, which only works
+# for a single user per process.
+ANALYZER_CLASSES = {
+    "squats": squat.SquatAnalyzer,
+    "pushups": pushup.PushupAnalyzer
+}
+
+
+def create_analyzer(exercise):
+    """
+    Returns a fresh analyzer for the given exercise so that every stream keeps
+    its own repetition state.
+    """
+    if exercise not in ANALYZER_CLASSES:
+        raise ValueError(f"No analyzer available for exercise '{exercise}'")
+    return ANALYZER_CLASSES[exercise]()
@@ -0,0 +1,296 @@
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import analyzers
+import landmark_math as lm
+
+
+class OnnxPoseBackend:
+    """
+    Batched CPU pose backend built on an ONNX landmark model and onnxruntime.
+    The model must have a dynamic batch axis, take RGB float input scaled to [0, 1]
+    (NHWC by default, NCHW with channels_first=True) and return at least the 33
+    BlazePose landmarks, either shaped (N, K, C) or flat (N, K*C) with
+    values_per_landmark=C. The first two channels are x, y: normalized to [0, 1],
+    or in input pixels with input_pixels=True (as the BlazePose landmark model
+    does, whose flat (N, 195) output is 39 landmarks of 5 values).
+    """
+
+    def __init__(self, model_path, input_size=256, channels_first=False, num_threads=0,
+                 values_per_landmark=None, input_pixels=False):
+        # onnxruntime is only required when batched inference is actually used
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.input_size = input_size
+        self.channels_first = channels_first
+        self.values_per_landmark = values_per_landmark
+        self.input_pixels = input_pixels
+
+    def preprocess(self, img):
+        """Converts a BGR frame into a single model input tensor (without batch axis)."""
+        resized = cv2.resize(img, (self.input_size, self.input_size))
+        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+        tensor = rgb.astype(np.float32) / 255.0
+        if self.channels_first:
+            tensor = tensor.transpose(2, 0, 1)
+        return tensor
+
+    def infer(self, batch):
+        """Runs one inference over a stacked batch and returns (N, 33, 2) normalized x, y."""
+        output = self.session.run(None, {self.input_name: batch})[0]
+        values = self.values_per_landmark or output.shape[-1]
+        output = output.reshape(len(batch), -1, values)
+        if output.shape[1] < 33 or values < 2:
+            raise ValueError(
+                f"Pose model output has {output.shape[1]} landmarks of {values} values per frame; "
+                f"at least 33 landmarks with x, y are needed. For a flat (N, K*C) output, "
+                f"set values_per_landmark=C."
+            )
+        coords = output[:, :33, :2]
+        if self.input_pixels:
+            coords = coords / self.input_size
+        return coords
+
+
+class PendingLandmarks:
+    """Handle returned by BatchInferenceService.submit; wait() yields the frame's lmList."""
+
+    def __init__(self, stream_id, tensor, shape):
+        self.stream_id = stream_id
+        self.tensor = tensor
+        self.shape = shape
+        self.lm_list = None
+        self.error = None
+        self._done = threading.Event()
+
+    def _resolve(self, lm_list=None, error=None):
+        self.lm_list = lm_list
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Landmarks for stream {self.stream_id} not ready")
+        if self.error is not None:
+            raise self.error
+        return self.lm_list
+
+
+class BatchInferenceService:
+    """
+    Collects frames submitted by many streams and runs them through the backend
+    as one batched inference.
+    A batch is dispatched as soon as max_batch_size frames are queued or max_wait_ms
+    has passed since the first frame of the batch arrived, whichever comes first.
+    Larger batches raise throughput; a longer wait raises per-frame latency.
+    """
+
+    def __init__(self, backend, max_batch_size=8, max_wait_ms=5.0):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._requests = queue.Queue()
+        self.running = True
+
+        # Throughput statistics
+        self.batches_run = 0
+        self.frames_run = 0
+
+        self.thread = threading.Thread(target=self._batch_loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, stream_id, img):
+        """
+        Queues a BGR frame for inference. Preprocessing runs on the caller's thread
+        so that it is spread across streams instead of serialized in the batch loop.
+        """
+        pending = PendingLandmarks(stream_id, self.backend.preprocess(img), img.shape)
+        self._requests.put(pending)
+        return pending
+
+    def _batch_loop(self):
+        while self.running:
+            try:
+                first = self._requests.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        try:
+            coords = self.backend.infer(np.stack([p.tensor for p in batch]))
+        except Exception as e:
+            # Never leave a stream blocked on a failed batch
+            for pending in batch:
+                pending._resolve(error=e)
+            return
+
+        self.batches_run += 1
+        self.frames_run += len(batch)
+
+        # Scatter landmarks back in the same [id, x, y] pixel format as getPosition
+        for pending, points in zip(batch, coords):
+            h, w = pending.shape[:2]
+            lm_list = [[id, int(x * w), int(y * h)] for id, (x, y) in enumerate(points)]
+            pending._resolve(lm_list=lm_list)
+
+    def stop(self):
+        """
+        Safely stops the batching thread and fails every request still queued,
+        so no stream stays blocked waiting on a batch that will never run.
+        """
+        self.running = False
+        if self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+
+        while True:
+            try:
+                pending = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            pending._resolve(error=RuntimeError("Batch inference service stopped"))
+
+
+class StreamSession:
+    """
+    One station's view of the shared service: submits its frames and feeds the
+    returned landmarks into its own analyzer instance.
+    """
+
+    def __init__(self, service, stream_id, exercise, user_profile, timeout=1.0):
+        self.service = service
+        self.timeout = timeout
+        self.stream_id = stream_id
+        self.user_profile = user_profile
+        self.analyzer = analyzers.create_analyzer(exercise)
+
+    def process(self, img):
+        lm_list = self.service.submit(self.stream_id, img).wait(self.timeout)
+        if not lm_list:
+            return None
+        angles = lm.get_angles(lm_list)
+        return self.analyzer.analyze_frame(angles, lm_list, self.user_profile)
+
+
+# --- BENCHMARK ---
+DEFAULT_VIDEOS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "videos_for_testing", name)
+    for name in ("squats.mp4", "sq2.mp4", "p2.mp4")
+]
+
+
+def _load_frames(path, limit=120):
+    """Decodes a short clip up front so the benchmark measures inference, not decoding."""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        success, img = cap.read()
+        if not success:
+            break
+        frames.append(img)
+    cap.release()
+    return frames
+
+
+def _run_streams(backend, clips, stream_count, max_batch_size, max_wait_ms, duration):
+    """Drives stream_count threads against one service and returns frames per second."""
+    service = BatchInferenceService(backend, max_batch_size, max_wait_ms)
+    profile = {"age": 25, "bmi": 22.0}
+    stop_at = time.perf_counter() + duration
+    processed = [0] * stream_count
+    errors = []
+
+    def worker(index):
+        session = StreamSession(service, index, "squats", profile)
+        frames = clips[index % len(clips)]
+        i = 0
+        try:
+            while time.perf_counter() < stop_at and not errors:
+                session.process(frames[i % len(frames)])
+                processed[index] += 1
+                i += 1
+        except Exception as e:
+            # Surfaced by the caller; a dead stream would otherwise just lower the fps
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(stream_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service.stop()
+    if errors:
+        raise errors[0]
+
+    avg_batch = service.frames_run / service.batches_run if service.batches_run else 0
+    return sum(processed) / duration, avg_batch
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Batched pose inference throughput benchmark",
+        epilog="The model must be an ONNX pose landmark model with a dynamic batch axis "
+               "that outputs at least the 33 BlazePose landmarks, e.g. the BlazePose "
+               "full landmark model converted to ONNX with a dynamic batch "
+               "(--values-per-landmark 5 --input-pixels)."
+    )
+    parser.add_argument("model", help="Path to a batch-capable ONNX pose landmark model")
+    parser.add_argument("--input-size", type=int, default=256)
+    parser.add_argument("--channels-first", action="store_true")
+    parser.add_argument("--values-per-landmark", type=int, default=None,
+                        help="Values per landmark when the model output is flat (N, K*C)")
+    parser.add_argument("--input-pixels", action="store_true",
+                        help="Model outputs x, y in input pixels instead of [0, 1]")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--videos", nargs="+", default=DEFAULT_VIDEOS)
+    args = parser.parse_args()
+
+    backend = OnnxPoseBackend(args.model, args.input_size, args.channels_first,
+                              values_per_landmark=args.values_per_landmark,
+                              input_pixels=args.input_pixels)
+    clips = [frames for frames in (_load_frames(v) for v in args.videos) if frames]
+    if not clips:
+        print("No frames could be decoded from the benchmark videos.")
+        return
+
+    print(f"{'streams':>8} {'unbatched fps':>14} {'batched fps':>12} {'avg batch':>10} {'speedup':>8}")
+    for count in args.streams:
+        single_fps, _ = _run_streams(backend, clips, count, 1, 0.0, args.duration)
+        batched_fps, avg_batch = _run_streams(
+            backend, clips, count, count, args.max_wait_ms, args.duration
+        )
+        speedup = batched_fps / single_fps if single_fps else 0
+        print(f"{count:>8} {single_fps:>14.1f} {batched_fps:>12.1f} {avg_batch:>10.2f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+import analyzers
+import landmark_math as lm
+import pose_module as pm
+
+
+def _counters(analyzer):
+    """Returns (rep_count, attempts, correct_reps) for either analyzer type."""
+    attempts = getattr(analyzer, "total_attempts", None)
+    if attempts is None:
+        attempts = analyzer.total_completed_reps
+    return analyzer.rep_count, attempts, analyzer.correct_reps
+
+
+def analyze_chunk(video_path, exercise, user_profile, start, end, warmup=0):
+    """
+    Runs a fresh poseDetector and analyzer over frames [start - warmup, end).
+    Warm-up frames let landmark smoothing and the stage machine converge but their
+    events are discarded; only counter changes on frames in [start, end) are
+    returned, as (frame_index, rep_delta, attempt_delta, correct_delta) tuples.
+    """
+    first = max(0, start - warmup)
+    cap = cv2.VideoCapture(video_path)
+    if first > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+
+    detector = pm.poseDetector()
+    analyzer = analyzers.create_analyzer(exercise)
+    prev = _counters(analyzer)
+    events = []
+
+    try:
+        for frame_index in range(first, end):
+            success, img = cap.read()
+            if not success:
+                break
+
+            detector.findPose(img, draw=False)
+            lm_list = detector.getPosition(img, draw=False)
+            if len(lm_list) == 0:
+                continue
+
+            analyzer.analyze_frame(lm.get_angles(lm_list), lm_list, user_profile)
+            curr = _counters(analyzer)
+            if curr != prev and frame_index >= start:
+                events.append((frame_index,) + tuple(c - p for c, p in zip(curr, prev)))
+            prev = curr
+    finally:
+        cap.release()
+
+    return events
+
+
+def _analyze_chunk_args(args):
+    return analyze_chunk(*args)
+
+
+def stitch_events(chunk_events):
+    """
+    Combines per-chunk events into session totals.
+    Chunks own disjoint frame ranges, so a rep is counted by the single chunk in
+    which it completes, even when its descent started in the previous chunk.
+    """
+    reps = attempts = correct = 0
+    for events in chunk_events:
+        for _, rep_delta, attempt_delta, correct_delta in events:
+            reps += rep_delta
+            attempts += attempt_delta
+            correct += correct_delta
+
+    accuracy = (correct / attempts * 100) if attempts > 0 else 0.0
+    return {
+        "rep_count": reps,
+        "attempts": attempts,
+        "correct_reps": correct,
+        "accuracy": round(accuracy, 2)
+    }
+
+
+def analyze_video_parallel(video_path, exercise, user_profile, workers=None, warmup_seconds=6.0):
+    """
+    Splits one recorded video into contiguous time chunks, analyzes them in parallel
+    processes and stitches the results.
+    warmup_seconds must exceed the longest single rep, so the stage machine at the
+    start of every chunk is in the same state as in a sequential run.
+    """
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+
+    # Streams without a reliable frame count cannot be split up front
+    if total_frames <= 0:
+        result = analyze_video_sequential(video_path, exercise, user_profile)
+        result["chunks"] = 1
+        return result
+
+    workers = workers or os.cpu_count() or 1
+    warmup = int(warmup_seconds * fps)
+    chunk_len = -(-total_frames // workers)
+    bounds = [(s, min(s + chunk_len, total_frames)) for s in range(0, total_frames, chunk_len)]
+
+    jobs = [(video_path, exercise, user_profile, s, e, warmup) for s, e in bounds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunk_events = list(pool.map(_analyze_chunk_args, jobs))
+
+    result = stitch_events(chunk_events)
+    result["chunks"] = len(bounds)
+    return result
+
+
+def analyze_video_sequential(video_path, exercise, user_profile):
+    """Reference single-process run over the whole video."""
+    events = analyze_chunk(video_path, exercise, user_profile, 0, 2 ** 62)
+    return stitch_events([events])
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chunk-parallel offline analysis of one long video")
+    parser.add_argument("video")
+    parser.add_argument("exercise", choices=sorted(analyzers.ANALYZER_CLASSES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--warmup", type=float, default=6.0, help="Warm-up overlap in seconds")
+    parser.add_argument("--age", type=int, default=25)
+    parser.add_argument("--bmi", type=float, default=22.0)
+    parser.add_argument("--verify", action="store_true", help="Also run sequentially and compare")
+    args = parser.parse_args()
+
+    profile = {"age": args.age, "bmi": args.bmi}
+
+    t0 = time.perf_counter()
+    parallel = analyze_video_parallel(args.video, args.exercise, profile, args.workers, args.warmup)
+    parallel_time = time.perf_counter() - t0
+    print(f"Parallel ({parallel['chunks']} chunks): {parallel} in {parallel_time:.1f}s")
+
+    if args.verify:
+        t0 = time.perf_counter()
+        sequential = analyze_video_sequential(args.video, args.exercise, profile)
+        sequential_time = time.perf_counter() - t0
+        print(f"Sequential: {sequential} in {sequential_time:.1f}s")
+        print(f"Speedup: {sequential_time / parallel_time:.2f}x")
+        for key in ("rep_count", "attempts", "correct_reps"):
+            if parallel[key] != sequential[key]:
+                print(f"MISMATCH in {key}: parallel={parallel[key]} sequential={sequential[key]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+import coach_server as cs
+
+
+def record_landmark_cache(video_path, cache_path):
+    """
+    Runs pose detection once over a video and stores its landmarks as an (N, 33, 3)
+    array, so load tests can replay realistic streams without MediaPipe.
+    Frames without a detection are left out, as they never reach the analyzers.
+    """
+    import pose_module as pm
+
+    frames, fps, _ = pm.extract_landmarks(video_path)
+    np.savez_compressed(cache_path, landmarks=np.array(frames, dtype=np.int16), fps=fps)
+    return len(frames)
+
+
+def load_landmark_cache(cache_path):
+    data = np.load(cache_path)
+    return data["landmarks"], float(data["fps"])
+
+
+async def _client(url, exercise, frames, fps, duration, stats):
+    # websockets is only required when the load generator is used
+    import websockets
+
+    payloads = [cs.encode_frame(lm_list) for lm_list in frames.tolist()]
+    interval = 1.0 / fps
+    sent_at = {}
+
+    async with websockets.connect(url, compression=None) as ws:
+        await ws.send(json.dumps({"type": "start", "exercise": exercise}))
+        await ws.recv()
+
+        async def reader():
+            async for message in ws:
+                event = json.loads(message)
+                if event["type"] == "update":
+                    stats["updates"] += 1
+                    sent = sent_at.pop(event["frame"], None)
+                    if sent is not None:
+                        stats["latencies"].append(time.perf_counter() - sent)
+                elif event["type"] == "saved":
+                    return
+
+        reader_task = asyncio.create_task(reader())
+        next_send = time.perf_counter()
+        stop_at = next_send + duration
+        frame = 0
+        while time.perf_counter() < stop_at:
+            frame += 1
+            sent_at[frame] = time.perf_counter()
+            await ws.send(payloads[(frame - 1) % len(payloads)])
+            stats["frames"] += 1
+            # Only responded frames are popped; forget the rest to stay bounded
+            sent_at.pop(frame - int(fps), None)
+            next_send += interval
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+        await ws.send(json.dumps({"type": "end"}))
+        await reader_task
+
+
+async def run_load(url, caches, sessions, duration, exercise):
+    streams = [load_landmark_cache(path) for path in caches]
+    stats = {"frames": 0, "updates": 0, "latencies": []}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(url, exercise, *streams[i % len(streams)], duration, stats)
+        for i in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(stats["latencies"])
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p99 = latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else 0.0
+    print(f"Sessions: {sessions}, frames: {stats['frames']} ({stats['frames'] / elapsed:.0f}/s), "
+          f"updates: {stats['updates']}, latency p50: {p50:.1f} ms, p99: {p99:.1f} ms")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load generator for the coaching server")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Extract a landmark cache from a video")
+    record.add_argument("video")
+    record.add_argument("cache")
+
+    replay = sub.add_parser("replay", help="Replay landmark caches as concurrent sessions")
+    replay.add_argument("caches", nargs="+")
+    replay.add_argument("--url", default="ws://localhost:8765")
+    replay.add_argument("--sessions", type=int, default=100)
+    replay.add_argument("--duration", type=float, default=30.0)
+    replay.add_argument("--exercise", default="squats")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        count = record_landmark_cache(args.video, args.cache)
+        print(f"Cached {count} landmark frames to {os.path.abspath(args.cache)}")
+    else:
+        asyncio.run(run_load(args.url, args.caches, args.sessions, args.duration, args.exercise))
+
+
+if __name__ == "__main__":
+    main()
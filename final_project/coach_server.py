@@ -0,0 +1,162 @@
+"""
+WebSocket coaching server for clients that run pose estimation themselves.
+
+Protocol (one session per connection):
+  1. Client sends a JSON text message:
+       {"type": "start", "exercise": "squats", "user_id": 3}
+     user_id is optional; without it a "profile" dictionary may be sent instead.
+  2. Client streams landmark frames as binary messages of FRAME_FORMAT:
+     33 (x, y) pixel coordinates as little-endian int16, 132 bytes per frame.
+  3. Server answers with a JSON "update" message only when the analyzer output
+     changes (rep count, stage, warnings or a completed rep).
+  4. Client sends {"type": "end"} (or disconnects); the session is logged through
+     user_profile and, for an explicit end, a "saved" message is returned.
+Malformed text messages get a JSON "error" reply; an invalid start request also
+closes the connection.
+"""
+
+import asyncio
+import json
+import struct
+
+import analyzers
+import landmark_math as lm
+import user_profile as up
+
+NUM_LANDMARKS = 33
+FRAME_FORMAT = struct.Struct("<" + "h" * (NUM_LANDMARKS * 2))
+DEFAULT_PROFILE = {"age": 25, "bmi": 22.0}
+
+
+def decode_frame(payload):
+    """Turns a binary landmark frame into the [id, x, y] lmList used by the analyzers."""
+    coords = FRAME_FORMAT.unpack(payload)
+    return [[id, coords[2 * id], coords[2 * id + 1]] for id in range(NUM_LANDMARKS)]
+
+
+def encode_frame(lm_list):
+    """Client-side counterpart of decode_frame."""
+    return FRAME_FORMAT.pack(*(int(v) for row in lm_list for v in row[1:3]))
+
+
+class CoachingSession:
+    """Per-connection analyzer state plus the last output sent to the client."""
+
+    def __init__(self, exercise, user_id, user_profile):
+        self.exercise = exercise
+        self.user_id = user_id
+        self.user_profile = user_profile
+        self.analyzer = analyzers.create_analyzer(exercise)
+        self.frames = 0
+        self.last_sent = None
+        self.result = {}
+
+    def process(self, payload):
+        """Analyzes one frame and returns an update message, or None if nothing changed."""
+        lm_list = decode_frame(payload)
+        self.frames += 1
+        self.result = self.analyzer.analyze_frame(lm.get_angles(lm_list), lm_list, self.user_profile)
+
+        key = (self.result["rep_count"], self.result["stage"], tuple(self.result["warnings"]))
+        if key == self.last_sent and not self.result.get("rep_event"):
+            return None
+        self.last_sent = key
+        return json.dumps({"type": "update", "frame": self.frames, **self.result})
+
+    async def save(self):
+        """Logs the session without blocking the event loop on SQLite."""
+        if self.user_id is None or self.frames == 0:
+            return None
+        return await asyncio.to_thread(
+            up.save_workout_session, self.user_id, self.exercise,
+            self.result.get("rep_count", 0), self.result.get("accuracy", 0.0)
+        )
+
+
+def _parse_message(message):
+    """Decodes a JSON text message, which must be an object."""
+    request = json.loads(message)
+    if not isinstance(request, dict):
+        raise ValueError("Messages must be JSON objects")
+    return request
+
+
+def _check_profile(profile):
+    """Rejects client-sent profiles the analyzers could not read."""
+    if not isinstance(profile, dict):
+        raise ValueError("profile must be an object")
+    for key in ("age", "bmi"):
+        value = profile.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"profile {key} must be a number")
+    if not isinstance(profile.get("fitness_level", ""), str):
+        raise ValueError("profile fitness_level must be a string")
+    return profile
+
+
+async def _start_session(message):
+    request = _parse_message(message)
+    if request.get("type") != "start":
+        raise ValueError("First message must be a start request")
+
+    user_id = request.get("user_id")
+    if user_id is not None and (isinstance(user_id, bool) or not isinstance(user_id, int)):
+        raise ValueError("user_id must be an integer")
+    profile = _check_profile(request.get("profile") or DEFAULT_PROFILE)
+    if user_id is not None:
+        profile = await asyncio.to_thread(up.get_user_profile, user_id) or profile
+    return CoachingSession(request.get("exercise", "squats"), user_id, profile)
+
+
+async def handle_client(websocket):
+    try:
+        session = await _start_session(await websocket.recv())
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        await websocket.send(json.dumps({"type": "error", "message": str(e)}))
+        return
+
+    await websocket.send(json.dumps({"type": "ready", "exercise": session.exercise}))
+    saved = False
+    try:
+        async for message in websocket:
+            if isinstance(message, bytes):
+                if len(message) != FRAME_FORMAT.size:
+                    continue
+                update = session.process(message)
+                if update:
+                    await websocket.send(update)
+                continue
+
+            try:
+                request = _parse_message(message)
+            except ValueError as e:
+                await websocket.send(json.dumps({"type": "error", "message": str(e)}))
+                continue
+            if request.get("type") == "end":
+                saved = True
+                log_id = await session.save()
+                await websocket.send(json.dumps({"type": "saved", "log_id": log_id, **session.result}))
+                return
+    finally:
+        # Disconnected mid-session: still persist what was done
+        if not saved:
+            await session.save()
+
+
+async def serve(host="0.0.0.0", port=8765):
+    # websockets is only required when the server mode is used
+    import websockets
+
+    async with websockets.serve(handle_client, host, port, max_size=4096, compression=None):
+        print(f"Coaching server listening on ws://{host}:{port}")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WebSocket coaching server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
@@ -0,0 +1,181 @@
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+
+import cv2
+
+import analyzers
+import landmark_math as lm
+import pose_module as pm
+
+VIEWS = ("front", "side")
+
+
+def _open_capture(source):
+    """Opens a camera index ("0", "1", ...) or a video file path."""
+    if isinstance(source, str) and source.isdigit():
+        return cv2.VideoCapture(int(source)), False
+    return cv2.VideoCapture(source), True
+
+
+def _capture_worker(view, source, results, stop_event):
+    """
+    Runs in its own process: captures one view, runs a dedicated poseDetector and
+    sends only the landmarks back, so no frames cross the process boundary.
+    Video files are stamped with their media time, cameras with the capture time.
+    """
+    cap, is_file = _open_capture(source)
+    detector = pm.poseDetector()
+    try:
+        while not stop_event.is_set():
+            success, img = cap.read()
+            captured_at = time.time()
+            if not success:
+                break
+            timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0 if is_file else captured_at
+
+            detector.findPose(img, draw=False)
+            lm_list = detector.getPosition(img, draw=False)
+            results.put((view, timestamp, (captured_at, time.time(), lm_list)))
+    finally:
+        cap.release()
+        # End-of-stream marker
+        results.put((view, None, None))
+
+
+class FramePairer:
+    """
+    Pairs front and side results whose timestamps lie within `tolerance` seconds.
+    Streams are ordered in time, so an unmatched head that is older than the other
+    view's head can never be matched later and is dropped.
+    """
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.pending = {view: deque() for view in VIEWS}
+        self.dropped = 0
+
+    def add(self, view, timestamp, item):
+        self.pending[view].append((timestamp, item))
+        pairs = []
+        front, side = self.pending["front"], self.pending["side"]
+        while front and side:
+            front_ts, side_ts = front[0][0], side[0][0]
+            if abs(front_ts - side_ts) <= self.tolerance:
+                pairs.append((front.popleft()[1], side.popleft()[1]))
+            elif front_ts < side_ts:
+                front.popleft()
+                self.dropped += 1
+            else:
+                side.popleft()
+                self.dropped += 1
+        return pairs
+
+
+def fuse_views(front_lm, side_lm):
+    """
+    Combines both views into the (angles, landmarks) pair consumed by the analyzers.
+    Joint angles come from the side view, where flexion depth is measured reliably;
+    landmarks come from the front view, so leg-width checks are never skipped as
+    they are when SquatAnalyzer.is_side_view detects a profile camera.
+    Falls back to whichever view has a detection when the other one has none.
+    """
+    if not front_lm and not side_lm:
+        return None, None
+    angle_source = side_lm or front_lm
+    landmark_source = front_lm or side_lm
+    return lm.get_angles(angle_source), landmark_source
+
+
+def run_dual_session(front_source, side_source, exercise, user_profile, tolerance_ms=None):
+    """
+    Captures both views in parallel worker processes and feeds the fused frames to
+    one analyzer. Returns the final analyzer output and latency statistics.
+    """
+    if tolerance_ms is None:
+        cap, _ = _open_capture(front_source)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        cap.release()
+        # Half a frame interval: the closest frame of the other view always qualifies
+        tolerance_ms = 500.0 / fps
+        frame_interval = 1.0 / fps
+    else:
+        frame_interval = 0.002 * tolerance_ms
+
+    results = mp.Queue(maxsize=64)
+    stop_event = mp.Event()
+    workers = [
+        mp.Process(target=_capture_worker, args=(view, source, results, stop_event), daemon=True)
+        for view, source in zip(VIEWS, (front_source, side_source))
+    ]
+    for w in workers:
+        w.start()
+
+    analyzer = analyzers.create_analyzer(exercise)
+    pairer = FramePairer(tolerance_ms / 1000.0)
+    latencies = []
+    view_latencies = []
+    res = {}
+
+    try:
+        while True:
+            try:
+                view, timestamp, item = results.get(timeout=5.0)
+            except queue.Empty:
+                break
+            # Once either view ends no further pairs are possible
+            if timestamp is None:
+                break
+
+            for front, side in pairer.add(view, timestamp, item):
+                angles, landmarks = fuse_views(front[2], side[2])
+                if angles is None:
+                    continue
+                res = analyzer.analyze_frame(angles, landmarks, user_profile)
+                # End-to-end: earliest capture of the pair until analyzer output.
+                # Single-camera equivalent: capture until landmarks of that view.
+                latencies.append(time.time() - min(front[0], side[0]))
+                view_latencies.append(max(front[1] - front[0], side[1] - side[0]))
+    finally:
+        stop_event.set()
+        for w in workers:
+            w.join(timeout=2.0)
+            if w.is_alive():
+                w.terminate()
+
+    latencies.sort()
+    single_view_ms = sum(view_latencies) / len(view_latencies) * 1000 if view_latencies else 0.0
+    mean_latency_ms = sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+    stats = {
+        "fused_frames": len(latencies),
+        "dropped_frames": pairer.dropped,
+        "frame_interval_ms": round(frame_interval * 1000, 1),
+        "single_view_latency_ms": round(single_view_ms, 1),
+        "mean_latency_ms": round(mean_latency_ms, 1),
+        "p95_latency_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1) if latencies else 0.0,
+        "within_one_frame": mean_latency_ms - single_view_ms <= frame_interval * 1000
+    }
+    return res, stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Synchronized front + side camera analysis")
+    parser.add_argument("front", help="Front camera index or video file")
+    parser.add_argument("side", help="Side camera index or video file")
+    parser.add_argument("exercise", choices=sorted(analyzers.ANALYZER_CLASSES))
+    parser.add_argument("--tolerance-ms", type=float, default=None)
+    parser.add_argument("--age", type=int, default=25)
+    parser.add_argument("--bmi", type=float, default=22.0)
+    args = parser.parse_args()
+
+    res, stats = run_dual_session(args.front, args.side, args.exercise,
+                                  {"age": args.age, "bmi": args.bmi}, args.tolerance_ms)
+    print(f"Result: {res}")
+    print(f"Latency: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Automatic exercise recognition from the landmark stream.
+
+Features are summary statistics over a sliding window of landmarks: the five
+joint angles plus torso tilt, wrist height and hip motion, all normalized by
+torso length so they do not depend on camera distance. Every feature is
+order-independent within the window, so the streaming recognizer can classify
+its ring buffer in place. The model is a standardized nearest-centroid
+classifier trained from the bundled test videos.
+
+The model file is not shipped: run `python exercise_classifier.py` once before
+using the "auto" exercise mode. It writes exercise_model.json and reports
+accuracy on held-out windows.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+import landmark_math as lm
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exercise_model.json")
+VIDEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "videos_for_testing")
+TRAINING_VIDEOS = {
+    "squats.mp4": "squats",
+    "sq2.mp4": "squats",
+    "p2.mp4": "pushups"
+}
+WINDOW = 30
+STRIDE = 5
+
+
+def extract_features(windows):
+    """
+    Computes the feature vector for landmark windows shaped (..., WINDOW, 33, 3).
+    Works on a single window or a whole stack of windows at once.
+    """
+    lms = np.asarray(windows, dtype=float)
+    angle_series = lm.get_angle_series(lms)
+    angles = np.stack([angle_series[name] for name in lm.ANGLE_NAMES], axis=-1)
+
+    shoulders = lms[..., [11, 12], 1:3].mean(axis=-2)
+    hips = lms[..., [23, 24], 1:3].mean(axis=-2)
+    torso = shoulders - hips
+    torso_len = np.linalg.norm(torso, axis=-1) + 1e-6
+
+    # 0 degrees when upright (squats), about 90 when horizontal (pushups)
+    tilt = np.degrees(np.arctan2(np.abs(torso[..., 0]), -torso[..., 1]))
+    wrist_height = (lms[..., [15, 16], 2].mean(axis=-1) - shoulders[..., 1]) / torso_len
+    hip_height = hips[..., 1] / torso_len
+
+    extra = np.stack([tilt.mean(axis=-1), wrist_height.mean(axis=-1),
+                      wrist_height.std(axis=-1), hip_height.std(axis=-1)], axis=-1)
+    return np.concatenate([angles.mean(axis=-2), angles.std(axis=-2),
+                           angles.min(axis=-2), angles.max(axis=-2), extra], axis=-1)
+
+
+def sliding_windows(landmarks, window=WINDOW, stride=STRIDE):
+    """(N, 33, 3) recording -> (B, window, 33, 3) view of overlapping windows."""
+    landmarks = np.asarray(landmarks, dtype=float)
+    if len(landmarks) < window:
+        return np.empty((0, window) + landmarks.shape[1:])
+    views = np.lib.stride_tricks.sliding_window_view(landmarks, window, axis=0)
+    return np.moveaxis(views, -1, 1)[::stride]
+
+
+class NearestCentroidModel:
+    """Nearest-centroid classifier over standardized features."""
+
+    def __init__(self, labels, centroids, mean, scale):
+        self.labels = list(labels)
+        self.centroids = np.asarray(centroids, dtype=float)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+
+    @classmethod
+    def fit(cls, features, labels):
+        labels = np.asarray(labels)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0) + 1e-6
+        z = (features - mean) / scale
+        names = sorted(set(labels.tolist()))
+        centroids = [z[labels == name].mean(axis=0) for name in names]
+        return cls(names, centroids, mean, scale)
+
+    def predict(self, features):
+        z = (np.atleast_2d(features) - self.mean) / self.scale
+        distances = ((z[:, None, :] - self.centroids[None, :, :]) ** 2).sum(axis=-1)
+        return [self.labels[i] for i in distances.argmin(axis=1)]
+
+    def save(self, path=MODEL_PATH):
+        with open(path, "w") as f:
+            json.dump({
+                "labels": self.labels,
+                "centroids": self.centroids.tolist(),
+                "mean": self.mean.tolist(),
+                "scale": self.scale.tolist(),
+                "window": WINDOW
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["labels"], data["centroids"], data["mean"], data["scale"])
+
+
+class ExerciseRecognizer:
+    """
+    Streaming recognizer fed with one lmList per frame.
+    Landmarks go into a preallocated ring buffer; every `stride` frames the window
+    is classified, and the reported exercise only changes after `confirm`
+    consecutive predictions agree, so a single odd window cannot switch analyzers.
+    """
+
+    def __init__(self, model, window=WINDOW, stride=STRIDE, confirm=3):
+        self.model = model
+        self.window = window
+        self.stride = stride
+        self.confirm = confirm
+
+        self.buffer = np.zeros((window, 33, 3), dtype=float)
+        self.frames_seen = 0
+        self.candidate = None
+        self.candidate_votes = 0
+        self.exercise = None
+
+    @classmethod
+    def load(cls, path=MODEL_PATH, **kwargs):
+        return cls(NearestCentroidModel.load(path), **kwargs)
+
+    def update(self, lm_list):
+        """Adds a frame and returns the currently recognized exercise (or None)."""
+        self.buffer[self.frames_seen % self.window] = lm_list
+        self.frames_seen += 1
+        if self.frames_seen < self.window or self.frames_seen % self.stride:
+            return self.exercise
+
+        prediction = self.model.predict(extract_features(self.buffer))[0]
+        if prediction == self.candidate:
+            self.candidate_votes += 1
+        else:
+            self.candidate = prediction
+            self.candidate_votes = 1
+        if self.candidate_votes >= self.confirm:
+            self.exercise = self.candidate
+        return self.exercise
+
+
+def _load_training_data():
+    """Extracts landmarks from every training video once; returns per-video data."""
+    import pose_module as pm
+
+    data = {}
+    for name, label in TRAINING_VIDEOS.items():
+        frames, _, inference_time = pm.extract_landmarks(os.path.join(VIDEO_DIR, name))
+        data[name] = (label, np.asarray(frames, dtype=float), inference_time)
+    return data
+
+
+def _split_windows(landmarks, start=0.0, end=1.0):
+    """Windows of the [start, end) fraction of a recording; none straddle the cut."""
+    n = len(landmarks)
+    return sliding_windows(landmarks[int(n * start):int(n * end)])
+
+
+def _fit(data, start=0.0, end=1.0, exclude=()):
+    """Fits a model on the [start, end) part of every video not in `exclude`."""
+    features, labels = [], []
+    for name, (label, landmarks, _) in data.items():
+        if name in exclude:
+            continue
+        windows = _split_windows(landmarks, start, end)
+        if not len(windows):
+            continue
+        features.append(extract_features(windows))
+        labels += [label] * len(windows)
+    return NearestCentroidModel.fit(np.concatenate(features), labels)
+
+
+def _score(model, label, windows):
+    predictions = model.predict(extract_features(windows))
+    return float(np.mean([p == label for p in predictions]) * 100)
+
+
+def train(path=MODEL_PATH):
+    data = _load_training_data()
+    model = _fit(data)
+    model.save(path)
+    windows = sum(len(sliding_windows(landmarks)) for _, landmarks, _ in data.values())
+    print(f"Trained on {windows} windows: {model.labels} -> {path}")
+    return model, data
+
+
+def evaluate(data, train_fraction=0.7):
+    """
+    Reports accuracy on data the model was not fitted on, plus classifier cost
+    versus pose inference.
+    Temporal split: fit on the first train_fraction of every video, score the rest.
+    Leave-one-video-out: for labels with several videos, fit without one video
+    and score all of its windows.
+    """
+    results = {}
+    holdout_model = _fit(data, 0.0, train_fraction)
+    print(f"Temporal split: fit on first {train_fraction:.0%} of each video, scored on the rest")
+    for name, (label, landmarks, inference_time) in data.items():
+        windows = _split_windows(landmarks, train_fraction, 1.0)
+        if not len(windows):
+            print(f"{name}: too short to hold out a window")
+            continue
+        accuracy = _score(holdout_model, label, windows)
+        results[name] = accuracy
+
+        # Streaming cost: one single-window classification, as done every `stride` frames
+        start = time.perf_counter()
+        for window in windows:
+            holdout_model.predict(extract_features(window))
+        classify_time = (time.perf_counter() - start) / len(windows)
+        per_frame = classify_time / STRIDE
+        share = per_frame / inference_time * 100 if inference_time else 0.0
+
+        print(f"{name}: {accuracy:.1f}% of {len(windows)} held-out windows as {label}; "
+              f"classify {classify_time * 1000:.3f} ms/window "
+              f"({per_frame * 1000:.3f} ms/frame, {share:.1f}% of pose inference "
+              f"{inference_time * 1000:.1f} ms)")
+
+    print("Leave-one-video-out")
+    for name, (label, landmarks, _) in data.items():
+        others = [other for other, (other_label, _, _) in data.items()
+                  if other != name and other_label == label]
+        windows = sliding_windows(landmarks)
+        if not others or not len(windows):
+            continue
+        accuracy = _score(_fit(data, exclude=(name,)), label, windows)
+        print(f"{name}: {accuracy:.1f}% of {len(windows)} windows as {label} "
+              f"(fitted on {', '.join(others)} for {label})")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train and evaluate the exercise recognizer")
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    _, data = train(args.model)
+    evaluate(data)
@@ -0,0 +1,158 @@
+"""
+Columnar export of the fitness database for analytics.
+
+Every exported table becomes a directory of part files (Parquet or Arrow IPC).
+Rows are streamed from SQLite in chunks, so memory is bounded by chunk_rows.
+All tables are append-only with AUTOINCREMENT ids, so the highest exported id is
+kept as a per-table watermark in export_state.json; later runs only append a new
+part with the rows above it.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+
+EXPORT_TABLES = ("users", "workout_logs", "rep_clips", "frame_logs", "frame_log_sessions")
+STATE_FILE = "export_state.json"
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _load_state(out_dir):
+    path = os.path.join(out_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_state(out_dir, state):
+    # Written atomically so an interrupted run never advances the watermark
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _arrow_schema(conn, table):
+    """Maps the declared SQLite column types onto a fixed Arrow schema."""
+    import pyarrow as pa
+
+    fields = []
+    for _, name, declared, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        declared = declared.upper()
+        if "INT" in declared:
+            arrow_type = pa.int64()
+        elif "REAL" in declared:
+            arrow_type = pa.float64()
+        else:
+            # TEXT and DATETIME (stored as text by SQLite)
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _open_writer(path, schema, fmt):
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
+
+
+def export_table(conn, table, out_dir, watermark=0, fmt="parquet", chunk_rows=50000):
+    """
+    Streams rows of `table` with id above `watermark` into one new part file.
+    Returns (rows_written, new_watermark).
+    """
+    import pyarrow as pa
+
+    schema = _arrow_schema(conn, table)
+    id_index = schema.get_field_index("id")
+    cursor = conn.execute(f"SELECT * FROM {table} WHERE id > ? ORDER BY id", (watermark,))
+
+    writer = None
+    written = 0
+    table_dir = os.path.join(out_dir, table)
+    path = os.path.join(table_dir, f"part-{time.strftime('%Y%m%d_%H%M%S')}-{watermark}{FORMATS[fmt]}")
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema
+            )
+            if writer is None:
+                os.makedirs(table_dir, exist_ok=True)
+                writer = _open_writer(path + ".tmp", schema, fmt)
+            if fmt == "parquet":
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            written += len(rows)
+            watermark = rows[-1][id_index]
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # Only complete parts become visible to readers of the export directory
+    if writer is not None:
+        os.replace(path + ".tmp", path)
+    return written, watermark
+
+
+def export_database(db_name="fitness_app.db", out_dir="analytics_export", fmt="parquet",
+                    chunk_rows=50000, full=False):
+    """
+    Exports every known table incrementally. With full=True the watermarks are
+    ignored and each table directory is replaced by a single fresh part, so
+    readers never see a row twice.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'")
+
+    os.makedirs(out_dir, exist_ok=True)
+    state = {} if full else _load_state(out_dir)
+
+    conn = sqlite3.connect(db_name)
+    try:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        summary = {}
+        for table in EXPORT_TABLES:
+            if full:
+                shutil.rmtree(os.path.join(out_dir, table), ignore_errors=True)
+            if table not in existing:
+                continue
+            written, watermark = export_table(conn, table, out_dir, state.get(table, 0), fmt, chunk_rows)
+            state[table] = watermark
+            summary[table] = written
+            # Persist progress per table so a failure later on does not re-export it
+            _save_state(out_dir, state)
+    finally:
+        conn.close()
+
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export workout data to columnar files")
+    parser.add_argument("--db", default="fitness_app.db")
+    parser.add_argument("--out", default="analytics_export")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    parser.add_argument("--chunk-rows", type=int, default=50000)
+    parser.add_argument("--full", action="store_true", help="Discard previous parts and export everything")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    summary = export_database(args.db, args.out, args.format, args.chunk_rows, args.full)
+    for table, rows in summary.items():
+        print(f"{table}: {rows} new rows")
+    print(f"Export finished in {time.perf_counter() - t0:.2f}s")
@@ -0,0 +1,86 @@
+import itertools
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import landmark_math as lm
+import user_profile as up
+
+_logger_ids = itertools.count(1)
+
+
+class FrameLogger:
+    """
+    Persists per-frame angles and analyzer outputs to the frame_logs table.
+    Rows are buffered and appended in batches by a background thread, so the frame
+    loop never waits on SQLite and memory stays bounded by max_pending batches.
+    If the writer falls that far behind, new batches are dropped and counted.
+    """
+
+    def __init__(self, db_name="fitness_app.db", batch_rows=500, max_pending=8):
+        # Make sure the schema exists before the writer thread starts
+        up.UserProfileManager(db_name)
+        self.db_name = db_name
+        self.batch_rows = batch_rows
+        # Unique per logger, so back-to-back segments never share frame rows
+        self.session_tag = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(_logger_ids)}"
+
+        self.frame_no = 0
+        self.rows = []
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.dropped_batches = 0
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def log(self, angles, res):
+        """Buffers one analyzed frame."""
+        self.frame_no += 1
+        self.rows.append((
+            self.session_tag, self.frame_no, time.time(),
+            *(angles.get(name) for name in lm.ANGLE_NAMES),
+            res.get("stage"), res.get("rep_count"), res.get("accuracy"),
+            "; ".join(res.get("warnings", []))
+        ))
+        if len(self.rows) >= self.batch_rows:
+            try:
+                self.jobs.put_nowait(self.rows)
+            except queue.Full:
+                self.dropped_batches += 1
+            self.rows = []
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.db_name)
+        try:
+            while True:
+                rows = self.jobs.get()
+                if rows is None:
+                    break
+                try:
+                    conn.executemany('''
+                        INSERT INTO frame_logs (session_tag, frame, timestamp, knee, hip, elbow,
+                                                shoulder, back, stage, rep_count, accuracy, warnings)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', rows)
+                    conn.commit()
+                except sqlite3.Error:
+                    pass  # Losing a batch of frame rows must never stop the session
+        finally:
+            conn.close()
+
+    def close(self, workout_log_id=None):
+        """Writes the remaining rows and links the session to its workout_logs row."""
+        if self.rows:
+            self.jobs.put(self.rows)
+            self.rows = []
+        self.jobs.put(None)
+        self.thread.join()
+
+        if workout_log_id is not None and self.frame_no:
+            conn = sqlite3.connect(self.db_name)
+            conn.execute('''
+                INSERT INTO frame_log_sessions (workout_log_id, session_tag) VALUES (?, ?)
+            ''', (workout_log_id, self.session_tag))
+            conn.commit()
+            conn.close()
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+
+import landmark_math as lm
+
+# Joints each analyzer cannot work without: the points of the angles it reads.
+# Landmarks outside this set are still filtered but never cause a frame skip.
+REQUIRED_JOINTS = {
+    "squats": set(lm.ANGLE_JOINTS["knee"]),
+    "pushups": set(lm.ANGLE_JOINTS["elbow"]) | set(lm.ANGLE_JOINTS["hip"])
+}
+# Shoulders and hips: enough to tell that a person is framed at all
+DEFAULT_REQUIRED_JOINTS = {11, 12, 23, 24}
+
+
+def required_joints_for(exercise):
+    return REQUIRED_JOINTS.get(exercise, DEFAULT_REQUIRED_JOINTS)
+
+
+def _smoothing_factor(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class LandmarkFilter:
+    """
+    Streaming filter between poseDetector and the analyzers.
+    Each frame is first gated on confidence: if any required joint has visibility
+    or presence below min_confidence, the frame is skipped before any filtering
+    or logic runs. Confident joints then pass through a one-euro filter over
+    float pixel coordinates, which smooths jitter at rest while following fast
+    movement with little lag. Low-confidence optional joints hold their last
+    filtered position. State is a fixed set of arrays per joint, O(1) per frame.
+    """
+
+    def __init__(self, required_joints=DEFAULT_REQUIRED_JOINTS, min_confidence=0.5,
+                 min_cutoff=1.0, beta=0.05, d_cutoff=1.0, num_landmarks=33):
+        self.required_joints = set(required_joints)
+        self.min_confidence = min_confidence
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+        # Per-joint filter state
+        self.x_prev = np.zeros((num_landmarks, 2))
+        self.dx_prev = np.zeros((num_landmarks, 2))
+        self.t_prev = np.full(num_landmarks, np.nan)
+
+        self.frames_processed = 0
+        self.frames_skipped = 0
+
+    def set_required_joints(self, required_joints):
+        self.required_joints = set(required_joints)
+
+    def process(self, raw_landmarks, timestamp):
+        """
+        raw_landmarks are the [id, x, y, visibility, presence] rows of getLandmarks.
+        Returns a filtered lmList of [id, x, y] rows, or None for a skipped frame.
+        """
+        raw = np.asarray(raw_landmarks, dtype=float)
+        confident = np.minimum(raw[:, 3], raw[:, 4]) >= self.min_confidence
+        if not all(confident[j] for j in self.required_joints):
+            self.frames_skipped += 1
+            return None
+        self.frames_processed += 1
+
+        points = raw[:, 1:3]
+        fresh = confident & np.isnan(self.t_prev)
+        update = confident & ~np.isnan(self.t_prev)
+
+        # First confident sighting of a joint initializes its filter
+        self.x_prev[fresh] = points[fresh]
+        self.dx_prev[fresh] = 0.0
+        self.t_prev[fresh] = timestamp
+
+        if update.any():
+            dt = np.maximum(timestamp - self.t_prev[update], 1e-3)[:, None]
+            x = points[update]
+            x_prev = self.x_prev[update]
+
+            a_d = _smoothing_factor(self.d_cutoff, dt)
+            dx = a_d * (x - x_prev) / dt + (1 - a_d) * self.dx_prev[update]
+            cutoff = self.min_cutoff + self.beta * np.abs(dx)
+            a = _smoothing_factor(cutoff, dt)
+
+            self.x_prev[update] = a * x + (1 - a) * x_prev
+            self.dx_prev[update] = dx
+            self.t_prev[update] = timestamp
+
+        # Joints never seen with confidence fall back to their raw position
+        unseen = np.isnan(self.t_prev)
+        filtered = np.where(unseen[:, None], points, self.x_prev)
+        return [[id, x, y] for id, (x, y) in enumerate(filtered.tolist())]
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+
+# Joint triplets (p1, p2, p3) for every angle consumed by the exercise logic modules.
+# The angle is measured at p2, matching poseDetector.findAngle.
+ANGLE_JOINTS = {
+    "knee": (23, 25, 27),
+    "hip": (11, 23, 25),
+    "elbow": (12, 14, 16),
+    "shoulder": (14, 12, 24),
+    "back": (12, 24, 26)  # Verticality reference
+}
+ANGLE_NAMES = tuple(ANGLE_JOINTS)
+
+
+def calculate_angle(lm_list, p1, p2, p3):
+    """
+    Calculates the angle at p2 between p1 and p3 from an lmList of [id, x, y] rows.
+    Produces the same value as poseDetector.findAngle for the same frame, but does not
+    need the MediaPipe results object, so landmarks can come from any source.
+    """
+    x1, y1 = lm_list[p1][1], lm_list[p1][2]
+    x2, y2 = lm_list[p2][1], lm_list[p2][2]
+    x3, y3 = lm_list[p3][1], lm_list[p3][2]
+
+    angle = math.degrees(math.atan2(y3 - y2, x3 - x2) -
+                         math.atan2(y1 - y2, x1 - x2))
+
+    if angle < 0:
+        angle += 360
+    if angle > 180:
+        angle = 360 - angle
+    return angle
+
+
+def get_angles(lm_list):
+    """Returns the angles dictionary expected by the exercise logic modules."""
+    return {name: calculate_angle(lm_list, *joints) for name, joints in ANGLE_JOINTS.items()}
+
+
+def get_angle_series(landmarks_array):
+    """
+    Vectorized get_angles over an (..., 33, 3) array of lmList rows.
+    Returns a dictionary of angle arrays shaped like the leading axes, e.g. 1-D
+    series for an (N, 33, 3) recording, the input expected by analyze_sequence.
+    """
+    lms = np.asarray(landmarks_array, dtype=float)
+    series = {}
+    for name, (p1, p2, p3) in ANGLE_JOINTS.items():
+        a, b, c = lms[..., p1, 1:3], lms[..., p2, 1:3], lms[..., p3, 1:3]
+        angle = np.degrees(np.arctan2(c[..., 1] - b[..., 1], c[..., 0] - b[..., 0]) -
+                           np.arctan2(a[..., 1] - b[..., 1], a[..., 0] - b[..., 0]))
+        angle = np.where(angle < 0, angle + 360, angle)
+        series[name] = np.where(angle > 180, 360 - angle, angle)
+    return series
@@ -1,11 +1,18 @@
 import cv2
 import time
 import pose_module as pm
+import landmark_math as lm
+import frame_ingest as fi
+import rep_clipper as rc
+import frame_logger as fl
+import landmark_filter as lf
 import user_profile as up
 import voice_engine as ve
 import squat_logic as squat
 import pushup_logic as pushup
 import bicep_logic as bicep
+import analyzers
+import exercise_classifier as ec
 
 # ===== ADDED HEART RATE INTEGRATION START =====
 import requests
@@ -33,6 +40,19 @@ hr_thread = threading.Thread(target=fetch_heart_rate, daemon=True)
 hr_thread.start()
 # ===== ADDED HEART RATE INTEGRATION END =====
 
+def save_segment(user_id, exercise, reps, accuracy, frame_log, clipper, save=True):
+    """
+    Logs one exercise segment and links its frame log and bad-form clips to that
+    workout_logs row. Returns the row id, or None when the segment is not saved.
+    """
+    log_id = up.save_workout_session(user_id, exercise, reps, accuracy) if save else None
+    frame_log.close(log_id)
+    clips = clipper.close()
+    if clips and log_id is not None:
+        up.save_rep_clips(log_id, clips)
+        print(f"Saved {len(clips)} bad-form rep clip(s) for review.")
+    return log_id
+
 def main():
     """
     Main orchestration script for the AI Gym Trainer.
@@ -50,17 +70,39 @@ def main():
     
     # 2. Exercise Selection
     print("\n--- Exercise Selection ---")
-    print("Available: squats, pushups, biceps")
+    print("Available: squats, pushups, biceps, auto (recognize automatically)")
     choice = input("Enter exercise to perform: ").strip().lower()
     
-    if choice not in ['squats', 'pushups', 'biceps']:
+    if choice not in ['squats', 'pushups', 'biceps', 'auto']:
         print("Invalid exercise selected. Exiting.")
         return
 
+    # Auto mode recognizes the exercise from the landmark stream and switches analyzers
+    exercise = None if choice == "auto" else choice
+    recognizer = None
+    auto_analyzer = None
+    if choice == "auto":
+        try:
+            recognizer = ec.ExerciseRecognizer.load()
+        except FileNotFoundError:
+            print("Auto mode needs a trained exercise model. Run once first: python exercise_classifier.py")
+            return
+
     # 3. Hardware & Pose Engine Setup
-    cap = cv2.VideoCapture('vlog1.mp4')
+    # Frames are decoded and resized into preallocated buffers
+    cap = fi.FrameSource('vlog1.mp4', display_h=720)
     detector = pm.poseDetector()
     p_time = 0
+
+    # Low-confidence frames are skipped and joints smoothed before any logic runs
+    landmark_filter = lf.LandmarkFilter(lf.required_joints_for(exercise))
+
+    # Bad-form reps are clipped to disk in the background for coach review
+    video_fps = cap.cap.get(cv2.CAP_PROP_FPS) or 30.0
+    clipper = rc.RepClipRecorder(fps=video_fps)
+
+    # Per-frame angles and analyzer outputs are persisted for analytics exports
+    frame_log = fl.FrameLogger()
     
     # Session tracking variables for database persistence
     final_reps = 0
@@ -70,41 +112,54 @@ def main():
 
     try:
         while True:
+            # Standardize frame for portrait-style UI if necessary
             success, img = cap.read()
             if not success:
                 break
-
-            # Standardize frame for portrait-style UI if necessary
-            h, w, _ = img.shape
-            display_h = 720
-            display_w = int(w * (display_h / h))
-            img = cv2.resize(img, (display_w, display_h))
+            display_w = cap.display_w
+            res = None
 
             # 4. Pose Detection
             # Use PoseModule to detect landmarks and calculate angles
             img = detector.findPose(img, draw=True)
-            lm_list = detector.getPosition(img, draw=False)
+            raw_landmarks = detector.getLandmarks(img)
+            lm_list = landmark_filter.process(raw_landmarks, time.time()) if raw_landmarks else None
 
-            if len(lm_list) != 0:
+            if lm_list:
                 # Prepare data structures for logic files
                 # Extracting specific angles needed by logic modules
-                angles = {
-                    "knee": detector.findAngle(img, 23, 25, 27, draw=False),
-                    "hip": detector.findAngle(img, 11, 23, 25, draw=False),
-                    "elbow": detector.findAngle(img, 12, 14, 16, draw=False),
-                    "shoulder": detector.findAngle(img, 14, 12, 24, draw=False),
-                    "back": detector.findAngle(img, 12, 24, 26, draw=False) # Verticality reference
-                }
+                angles = lm.get_angles(lm_list)
 
                 # 5. Modular Logic Routing
                 res = {}
-                if choice == "squats":
+                if choice == "auto":
+                    detected = recognizer.update(lm_list)
+                    if detected and detected != exercise:
+                        # Log the finished segment with its own frames and clips,
+                        # then start fresh ones for the next exercise
+                        if exercise:
+                            save_segment(user_id, exercise, final_reps, final_accuracy,
+                                         frame_log, clipper, save=final_reps > 0)
+                            frame_log = fl.FrameLogger()
+                            clipper = rc.RepClipRecorder(fps=video_fps)
+                        exercise = detected
+                        auto_analyzer = analyzers.create_analyzer(detected)
+                        landmark_filter.set_required_joints(lf.required_joints_for(detected))
+                        final_reps = 0
+                        final_accuracy = 0.0
+                        ve.speak_motivation(f"Detected {detected}. Counting reps now.")
+                    if auto_analyzer:
+                        res = auto_analyzer.analyze_frame(angles, lm_list, profile)
+                elif choice == "squats":
                     res = squat.process_squat(angles, lm_list, profile)
                 elif choice == "pushups":
                     res = pushup.process_pushup(angles, lm_list, profile)
                 elif choice == "biceps":
                     res = bicep.process_bicep(angles, lm_list, profile)
 
+                if res:
+                    frame_log.log(angles, res)
+
                 # Update session stats
                 curr_reps = res.get("rep_count", 0)
                 final_accuracy = res.get("accuracy", 0.0)
@@ -150,6 +205,8 @@ def main():
             cv2.putText(img, f"FPS: {int(fps)}", (display_w - 100, 30), 
                         cv2.FONT_HERSHEY_DUPLEX, 0.6, (255, 0, 255), 1)
 
+            clipper.add_frame(img, res)
+
             cv2.imshow("AI Gym Trainer", img)
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
@@ -158,9 +215,14 @@ def main():
         # 8. Session Persistence
         # Ensure session is saved even if user quits mid-workout
         print(f"\nSaving session for {profile['name']}...")
-        up.save_workout_session(user_id, choice, final_reps, final_accuracy)
+        save_segment(user_id, exercise or choice, final_reps, final_accuracy, frame_log, clipper)
         ve.speak_motivation("Workout complete. Session saved to database.")
         
+        stats = cap.get_stats()
+        print(f"Frames: {stats['frames_read']}, buffer allocations: {stats['reallocations']}, "
+              f"peak RSS: {stats['peak_rss_mb']} MB, "
+              f"low-confidence frames skipped: {landmark_filter.frames_skipped}")
+
         cap.release()
         cv2.destroyAllWindows()
 
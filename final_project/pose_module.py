@@ -1,26 +1,33 @@
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
 import math
 
 class poseDetector():
-    def __init__(self, mode=False, smooth=True, detectioncon=0.5, trackcon=0.5):
+    def __init__(self, mode=False, smooth=True, detectioncon=0.5, trackcon=0.5, complexity=1):
         self.mode = mode
         self.smooth = smooth
         self.detectioncon = detectioncon
         self.trackcon = trackcon
+        self.complexity = complexity  # 0 = lite, 1 = full, 2 = heavy
 
         self.mpPose = mp.solutions.pose
         self.pose = self.mpPose.Pose(
             static_image_mode=self.mode,
+            model_complexity=self.complexity,
             smooth_landmarks=self.smooth,
             min_detection_confidence=self.detectioncon,
             min_tracking_confidence=self.trackcon
         )
         self.mpDraw = mp.solutions.drawing_utils
+        # Reused destination for the BGR -> RGB conversion
+        self._imgRGB = None
 
     def findPose(self, img, draw=True):
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        if self._imgRGB is None or self._imgRGB.shape != img.shape:
+            self._imgRGB = np.empty_like(img)
+        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self._imgRGB)
         self.results = self.pose.process(imgRGB)
 
         if self.results.pose_landmarks and draw:
@@ -40,6 +47,19 @@ class poseDetector():
                     cv2.circle(img, (cx, cy), 5, (0, 0, 255), cv2.FILLED)
         return lmList
 
+    def getLandmarks(self, img):
+        """
+        Returns [id, x, y, visibility, presence] rows with float pixel coordinates,
+        keeping the confidence values that getPosition drops.
+        """
+        lmList = []
+        if self.results.pose_landmarks:
+            h, w, c = img.shape
+            for id, lm in enumerate(self.results.pose_landmarks.landmark):
+                presence = lm.presence if lm.HasField("presence") else 1.0
+                lmList.append([id, lm.x * w, lm.y * h, lm.visibility, presence])
+        return lmList
+
 
     def findAngle(self, img, p1, p2, p3, draw=True):
         """
@@ -77,6 +97,34 @@ class poseDetector():
             
         return angle
 
+def extract_landmarks(video_path):
+    """
+    Runs pose detection over a whole video.
+    Returns (lmLists of frames with a detection, video fps, mean inference seconds).
+    """
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    detector = poseDetector()
+    frames = []
+    inference_time = 0.0
+    count = 0
+
+    while True:
+        success, img = cap.read()
+        if not success:
+            break
+        start = time.perf_counter()
+        detector.findPose(img, draw=False)
+        inference_time += time.perf_counter() - start
+        count += 1
+
+        lmList = detector.getPosition(img, draw=False)
+        if len(lmList) != 0:
+            frames.append(lmList)
+
+    cap.release()
+    return frames, fps, (inference_time / count if count else 0.0)
+
 def main():
     cap = cv2.VideoCapture('bicep1.mp4')
     pTime = 0
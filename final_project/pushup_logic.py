@@ -1,5 +1,6 @@
 import numpy as np
 import time
+import sequence_ops as seq
 
 class PushupAnalyzer:
     """
@@ -81,6 +82,7 @@ class PushupAnalyzer:
                 self.state = "bent"
 
         # Transition 2: Returning to full extension
+        rep_event = None
         if elbow_angle > self.EXTENDED_THRESHOLD:
             if self.state == "bent":
                 # A cycle is complete
@@ -91,6 +93,7 @@ class PushupAnalyzer:
                     self.rep_count += 1
                     if self.current_rep_is_valid:
                         self.correct_reps += 1
+                rep_event = "valid" if self.depth_reached and self.current_rep_is_valid else "invalid"
                 
                 # MANDATORY RESET: Reset flags for the next rep cycle
                 self.state = "extended"
@@ -106,7 +109,48 @@ class PushupAnalyzer:
             "rep_count": self.rep_count,
             "stage": self.state,
             "accuracy": round(accuracy, 2),
-            "warnings": self.warnings
+            "warnings": self.warnings,
+            "rep_event": rep_event  # "valid"/"invalid" on the frame a cycle completes
+        }
+
+    def analyze_sequence(self, angles_array, landmarks_array, user_profile):
+        """
+        Vectorized offline counterpart of analyze_frame over a whole recording.
+        Gives the same reps as feeding every frame, in order, to a fresh analyzer.
+        angles_array is indexed by angle name (dict of 1-D arrays or structured array);
+        landmarks_array is accepted for API symmetry with the squat analyzer.
+        """
+        elbow = np.asarray(angles_array["elbow"], dtype=float)
+        hip = np.asarray(angles_array["hip"], dtype=float)
+
+        bent_threshold, _ = self._get_leniency_config(user_profile)
+
+        # 1. BODY STRAIGHTNESS: consecutive extreme-bend frames beyond STABILITY_FRAMES
+        hip_bent = hip < self.HIP_EXTREME_BEND
+        bend_count = seq.counter_since_reset(hip_bent, ~hip_bent)
+        flawed = np.cumsum(hip_bent & (bend_count > self.STABILITY_FRAMES))
+
+        # 2. REP CYCLES: EXTENDED -> BENT -> EXTENDED
+        starts, ends, mid_rep = seq.find_cycles(elbow < bent_threshold, elbow > self.EXTENDED_THRESHOLD)
+
+        # Rep validity resets only on completion, so each rep owns every frame
+        # since the previous completion, including the completing frame itself
+        flawed_at_end = flawed[ends]
+        flawed_before = np.concatenate(([0], flawed_at_end[:-1]))
+        valid = (flawed_at_end - flawed_before) == 0
+        rep_accuracy = seq.running_accuracy(valid)
+
+        return {
+            "rep_count": len(ends),
+            "stage": "bent" if mid_rep else "extended",
+            "accuracy": float(rep_accuracy[-1]) if len(ends) else 0.0,
+            "reps": {
+                "start": starts,
+                "end": ends,
+                "min_angle": seq.segment_min(elbow, starts, ends),
+                "valid": valid,
+                "accuracy": rep_accuracy
+            }
         }
 
 # --- PUBLIC API ---
@@ -116,4 +160,10 @@ def process_pushup(angles, landmarks, user_profile):
     """
     Main entry point for push-up logic with strict depth validation.
     """
-    return _analyzer.analyze_frame(angles, landmarks, user_profile)
\ No newline at end of file
+    return _analyzer.analyze_frame(angles, landmarks, user_profile)
+
+def analyze_sequence(angles_array, landmarks_array, user_profile):
+    """
+    Offline push-up analysis of a whole angle/landmark time series in one pass.
+    """
+    return PushupAnalyzer().analyze_sequence(angles_array, landmarks_array, user_profile)
@@ -0,0 +1,144 @@
+import itertools
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Stages in which no rep is in progress
+REST_STAGES = ("up", "extended")
+
+_recorder_ids = itertools.count(1)
+
+
+class RepClipRecorder:
+    """
+    Keeps a fixed-size ring of recent frames, downscaled and JPEG-compressed, and
+    whenever an analyzer marks a rep invalid hands that rep's window plus padding to
+    a background thread that decodes and writes it to a short clip on disk.
+    A compressed 640x360 frame takes tens of KB instead of ~700 KB raw, so the ring
+    stays in the tens of MB. Clips are handed over as references to the immutable
+    JPEG bytes, and at most max_pending clips wait for the encoder; the frame loop
+    itself never copies a clip or touches disk.
+    """
+
+    def __init__(self, clip_dir="rep_clips", capacity=300, scale=0.5, fps=30.0,
+                 padding=30, max_pending=2, jpeg_quality=80):
+        self.clip_dir = clip_dir
+        self.capacity = capacity
+        self.scale = scale
+        self.fps = fps
+        self.padding = padding
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+
+        self.ring = [None] * capacity
+        self.ring_bytes = 0
+        self.size = None
+        self._small = None
+        self.frame_no = 0
+
+        # Current rep tracking
+        self.rep_start = None
+        self.rep_warnings = []
+        self.waiting = []
+
+        # Finished clips, saved against the session row once it exists
+        self.clips = []
+        self.skipped_clips = 0
+        self._lock = threading.Lock()
+
+        self.jobs = queue.Queue(maxsize=max_pending)
+        # Unique per recorder, so back-to-back segments never overwrite each other's clips
+        self.session_tag = f"{time.strftime('%Y%m%d_%H%M%S')}_{next(_recorder_ids)}"
+        self.thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.thread.start()
+
+    def memory_limit_bytes(self):
+        """
+        Approximate bound on frame memory: the ring plus, in the worst case, one
+        ring's worth of overwritten frames still referenced by each pending clip.
+        """
+        return self.ring_bytes * (1 + self.jobs.maxsize)
+
+    def add_frame(self, img, res=None):
+        """
+        Stores a downscaled, compressed copy of the frame and follows the analyzer output.
+        res is the dictionary returned by analyze_frame, or None when no pose was found.
+        """
+        if self.size is None:
+            h, w = img.shape[:2]
+            self.size = (int(w * self.scale), int(h * self.scale))
+
+        # Resize into a reused buffer, then keep only the JPEG bytes
+        self._small = cv2.resize(img, self.size, dst=self._small)
+        success, encoded = cv2.imencode(".jpg", self._small, self.encode_params)
+        slot = self.frame_no % self.capacity
+        old = self.ring[slot]
+        self.ring[slot] = encoded.tobytes() if success else None
+        self.ring_bytes += len(self.ring[slot] or b"") - len(old or b"")
+
+        if res:
+            if self.rep_start is None and res.get("stage") not in REST_STAGES:
+                self.rep_start = self.frame_no
+            for warning in res.get("warnings", []):
+                if warning not in self.rep_warnings:
+                    self.rep_warnings.append(warning)
+
+            if res.get("rep_event"):
+                if res["rep_event"] == "invalid":
+                    start = self.rep_start if self.rep_start is not None else self.frame_no
+                    self.waiting.append((start, self.frame_no, self.rep_warnings))
+                self.rep_start = None
+                self.rep_warnings = []
+
+        # Hand over clips once their trailing padding has been recorded
+        while self.waiting and self.frame_no >= self.waiting[0][1] + self.padding:
+            self._snapshot(*self.waiting.pop(0), last=self.frame_no)
+
+        self.frame_no += 1
+
+    def _snapshot(self, start, end, warnings, last, block=False):
+        # Frames older than the ring capacity have already been overwritten
+        first = max(start - self.padding, last - self.capacity + 1, 0)
+        # References to immutable bytes: nothing is copied on the frame loop
+        frames = [self.ring[f % self.capacity] for f in range(first, last + 1)]
+        try:
+            self.jobs.put((frames, first, end, warnings), block=block)
+        except queue.Full:
+            # Encoder is behind; dropping a clip is preferable to stalling the frame loop
+            self.skipped_clips += 1
+
+    def _encode_loop(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            frames, start, end, warnings = job
+            try:
+                os.makedirs(self.clip_dir, exist_ok=True)
+                path = os.path.join(self.clip_dir, f"{self.session_tag}_frame{start}.mp4")
+                writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), self.fps, self.size)
+                for data in frames:
+                    if data is not None:
+                        writer.write(cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR))
+                writer.release()
+                with self._lock:
+                    self.clips.append({
+                        "path": path,
+                        "start_frame": start,
+                        "end_frame": end,
+                        "warning": ", ".join(warnings)
+                    })
+            except Exception:
+                pass  # A failed clip must never affect the session
+
+    def close(self):
+        """Flushes reps still waiting for padding, finishes encoding and returns the clips."""
+        while self.waiting:
+            self._snapshot(*self.waiting.pop(0), last=self.frame_no - 1, block=True)
+        self.jobs.put(None)
+        self.thread.join()
+        with self._lock:
+            return list(self.clips)
@@ -0,0 +1,58 @@
+"""
+Vectorized building blocks used by the offline analyze_sequence APIs.
+Each helper reproduces, over a whole time series, a piece of per-frame state that
+the streaming analyzers keep in instance attributes.
+"""
+
+import numpy as np
+
+
+def counter_since_reset(increment, reset):
+    """
+    Value of a stability counter after every frame, where the counter grows by one on
+    frames flagged in `increment`, drops to zero on frames flagged in `reset` and is
+    left untouched otherwise (e.g. SquatAnalyzer.warning_counters).
+    """
+    totals = np.cumsum(increment, dtype=np.int64)
+    base = np.maximum.accumulate(np.where(reset, totals, 0)) if len(totals) else totals
+    return totals - base
+
+
+def find_cycles(enter, leave):
+    """
+    Hysteresis state machine that starts at rest, becomes active on the first `enter`
+    frame and returns to rest on the first following `leave` frame.
+    `enter` and `leave` must never be true on the same frame.
+    Returns (starts, ends, active_at_end) for the completed cycles.
+    """
+    events = np.zeros(len(enter), dtype=np.int8)
+    events[enter] = 1
+    events[leave] = -1
+
+    idx = np.flatnonzero(events)
+    vals = events[idx]
+    # Only the first event after a state change matters; rest is the initial state
+    keep = vals != np.concatenate(([-1], vals[:-1]))
+    idx, vals = idx[keep], vals[keep]
+
+    starts = idx[vals == 1]
+    ends = idx[vals == -1]
+    return starts[:len(ends)], ends, len(starts) > len(ends)
+
+
+def segment_min(values, starts, ends):
+    """Minimum of values over every inclusive [start, end] segment."""
+    if len(starts) == 0:
+        return np.empty(0, dtype=float)
+    marks = np.zeros(len(values) + 1, dtype=np.int64)
+    marks[starts] += 1
+    marks[ends + 1] -= 1
+    inside = np.cumsum(marks)[:len(values)] > 0
+    return np.minimum.reduceat(np.where(inside, values, np.inf), starts)
+
+
+def running_accuracy(correct):
+    """Accuracy reported by the streaming analyzers after each completed cycle."""
+    ratios = np.cumsum(correct) / np.arange(1, len(correct) + 1) * 100
+    # Python's round() keeps the values identical to the streaming output
+    return np.array([round(r, 2) for r in ratios.tolist()])
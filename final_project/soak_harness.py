@@ -0,0 +1,188 @@
+"""
+Long-running soak test for the per-frame runtime.
+
+Loops the bundled test videos as fast as possible (no display, no frame pacing)
+through the same pieces main.py uses: pose detection, the exercise analyzer,
+voice feedback, rep clipping and frame logging. Resource usage is sampled at a
+fixed interval and compared with a baseline taken after warm-up; the run fails
+when any growth exceeds its budget.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import analyzers
+import frame_ingest as fi
+import frame_logger as fl
+import landmark_math as lm
+import pose_module as pm
+import rep_clipper as rc
+import voice_engine as ve
+
+VIDEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "videos_for_testing")
+SOAK_VIDEOS = {
+    "squats.mp4": "squats",
+    "sq2.mp4": "squats",
+    "p2.mp4": "pushups"
+}
+DEFAULT_PROFILE = {"age": 25, "bmi": 22.0}
+
+
+def current_rss_mb():
+    """Current resident set size in MB, or None when it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def open_fd_count():
+    """Number of open file descriptors (handles on Windows), or None if unavailable."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        pass
+    try:
+        import psutil
+        process = psutil.Process()
+        return process.num_handles() if sys.platform == "win32" else process.num_fds()
+    except ImportError:
+        return None
+
+
+def sample_resources(latencies):
+    return {
+        "rss_mb": current_rss_mb(),
+        "threads": threading.active_count(),
+        "fds": open_fd_count(),
+        "latency_ms": statistics.median(latencies) * 1000 if latencies else None
+    }
+
+
+def check_budgets(baseline, sample, budgets):
+    """Returns a list of human-readable budget violations."""
+    failures = []
+    for key, limit in (("rss_mb", budgets["rss_mb"]), ("threads", budgets["threads"]),
+                       ("fds", budgets["fds"])):
+        if baseline[key] is not None and sample[key] is not None:
+            growth = sample[key] - baseline[key]
+            if growth > limit:
+                failures.append(f"{key} grew by {growth:.1f} (budget {limit})")
+
+    if baseline["latency_ms"] and sample["latency_ms"]:
+        drift = sample["latency_ms"] / baseline["latency_ms"] - 1
+        if drift > budgets["latency_drift"]:
+            failures.append(f"per-frame latency drifted by {drift:.0%} (budget {budgets['latency_drift']:.0%})")
+    return failures
+
+
+def run_soak(duration, budgets, warmup=60.0, sample_every=30.0, log=print):
+    """
+    Runs the soak loop for `duration` seconds and returns the list of violations
+    (empty when every budget held).
+    """
+    detector = pm.poseDetector()
+    db_path = os.path.join(tempfile.mkdtemp(prefix="soak_"), "soak.db")
+    frame_log = fl.FrameLogger(db_path)
+    clipper = rc.RepClipRecorder(clip_dir=os.path.dirname(db_path))
+
+    start = time.perf_counter()
+    next_sample = start + warmup
+    baseline = None
+    latencies = []
+    failures = []
+    videos = [(os.path.join(VIDEO_DIR, name), exercise) for name, exercise in SOAK_VIDEOS.items()]
+
+    while time.perf_counter() - start < duration and not failures:
+        for path, exercise in videos:
+            cap = fi.FrameSource(path, display_h=720)
+            analyzer = analyzers.create_analyzer(exercise)
+            final_reps = 0
+
+            while True:
+                frame_start = time.perf_counter()
+                success, img = cap.read()
+                if not success:
+                    break
+
+                detector.findPose(img, draw=True)
+                lm_list = detector.getPosition(img, draw=False)
+                res = None
+                if lm_list:
+                    angles = lm.get_angles(lm_list)
+                    res = analyzer.analyze_frame(angles, lm_list, DEFAULT_PROFILE)
+                    frame_log.log(angles, res)
+                    if res["rep_count"] > final_reps:
+                        final_reps = res["rep_count"]
+                        ve.speak_rep_count(final_reps)
+                    for warning in res["warnings"]:
+                        ve.speak_warning(warning)
+                clipper.add_frame(img, res)
+                latencies.append(time.perf_counter() - frame_start)
+
+                now = time.perf_counter()
+                if now >= next_sample:
+                    sample = sample_resources(latencies)
+                    latencies = []
+                    next_sample = now + sample_every
+                    if baseline is None:
+                        baseline = sample
+                        log(f"Baseline after warm-up: {baseline}")
+                    else:
+                        failures = check_budgets(baseline, sample, budgets)
+                        log(f"[{(now - start) / 60:6.1f} min] {sample}")
+                        if failures:
+                            break
+                if now - start >= duration:
+                    break
+
+            cap.release()
+            if failures or time.perf_counter() - start >= duration:
+                break
+
+    frame_log.close()
+    clipper.close()
+    log(f"Peak RSS: {fi.peak_rss_mb()} MB")
+    return failures
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-hour soak test with growth budgets")
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--warmup", type=float, default=60.0, help="Seconds before the baseline sample")
+    parser.add_argument("--sample-every", type=float, default=30.0)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64.0)
+    parser.add_argument("--max-thread-growth", type=int, default=2)
+    parser.add_argument("--max-fd-growth", type=int, default=8)
+    parser.add_argument("--max-latency-drift", type=float, default=0.25)
+    args = parser.parse_args()
+
+    budgets = {
+        "rss_mb": args.max_rss_growth_mb,
+        "threads": args.max_thread_growth,
+        "fds": args.max_fd_growth,
+        "latency_drift": args.max_latency_drift
+    }
+    failures = run_soak(args.hours * 3600, budgets, args.warmup, args.sample_every)
+    if failures:
+        print("SOAK FAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("Soak passed: all growth budgets held.")
+
+
+if __name__ == "__main__":
+    main()
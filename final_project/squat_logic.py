@@ -1,5 +1,6 @@
 import numpy as np
 import time
+import sequence_ops as seq
 
 class SquatAnalyzer:
     """
@@ -105,6 +106,7 @@ class SquatAnalyzer:
             self.stage = "down"
 
         # Transition to UP (Completion Phase)
+        rep_event = None
         if knee_angle > self.UP_THRESHOLD:
             if self.stage == "down":
                 # Cycle complete attempt
@@ -115,6 +117,7 @@ class SquatAnalyzer:
                     if rep_is_valid:
                         self.rep_count += 1
                         self.correct_reps += 1
+                rep_event = "valid" if self.depth_reached and rep_is_valid else "invalid"
                 
                 # MANDATORY RESET: Reset depth flag and stage for next cycle
                 self.stage = "up"
@@ -133,7 +136,72 @@ class SquatAnalyzer:
             "rep_count": self.rep_count,
             "stage": self.stage,
             "accuracy": round(accuracy, 2),
-            "warnings": self.warnings
+            "warnings": self.warnings,
+            "rep_event": rep_event  # "valid"/"invalid" on the frame a cycle completes
+        }
+
+    def analyze_sequence(self, angles_array, landmarks_array, user_profile):
+        """
+        Vectorized offline counterpart of analyze_frame over a whole recording.
+        Gives the same reps as feeding every frame, in order, to a fresh analyzer.
+        angles_array is indexed by angle name (dict of 1-D arrays or structured array);
+        landmarks_array has shape (N, 33, 3) with the [id, x, y] rows of getPosition.
+        """
+        knee = np.asarray(angles_array["knee"], dtype=float)
+        if len(knee) == 0:
+            # Nothing to replay: same result as a fresh analyzer that saw no frames
+            empty = np.empty(0, dtype=int)
+            return {
+                "rep_count": 0,
+                "stage": "up",
+                "accuracy": 0.0,
+                "reps": {
+                    "start": empty,
+                    "end": empty,
+                    "min_angle": np.empty(0),
+                    "valid": np.empty(0, dtype=bool),
+                    "accuracy": np.empty(0)
+                }
+            }
+        lms = np.asarray(landmarks_array, dtype=float).reshape(len(knee), -1, 3)
+
+        user_cat = self._get_user_category(user_profile)
+        depth_threshold = self._get_depth_threshold(user_cat)
+
+        # 1. POSTURE VALIDATION (stability counters replayed over all frames)
+        side_view = np.abs(lms[:, 11, 1] - lms[:, 12, 1]) < self.SIDE_VIEW_X_LIMIT
+        hip_width = np.abs(lms[:, 23, 1] - lms[:, 24, 1])
+        ankle_dist = np.abs(lms[:, 27, 1] - lms[:, 28, 1])
+        checked = ~side_view & (hip_width >= 10)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            leg_ratio = ankle_dist / hip_width
+
+        too_close = checked & (leg_ratio < 0.8)
+        too_wide = checked & (leg_ratio > 1.8)
+        reset = checked & ~too_close & ~too_wide
+        close_count = seq.counter_since_reset(too_close, reset)
+        wide_count = seq.counter_since_reset(too_wide, reset)
+        frame_valid = ~((too_close & (close_count > self.STABILITY_FRAMES)) |
+                        (too_wide & (wide_count > self.STABILITY_FRAMES)))
+
+        # 2. REP CYCLES: depth reached -> back above UP_THRESHOLD
+        starts, ends, mid_rep = seq.find_cycles(knee < depth_threshold, knee > self.UP_THRESHOLD)
+
+        # A squat is only valid if posture holds on the frame that completes it
+        valid = frame_valid[ends]
+        rep_accuracy = seq.running_accuracy(valid)
+
+        return {
+            "rep_count": int(valid.sum()),
+            "stage": "down" if mid_rep else "up",
+            "accuracy": float(rep_accuracy[-1]) if len(ends) else 0.0,
+            "reps": {
+                "start": starts,
+                "end": ends,
+                "min_angle": seq.segment_min(knee, starts, ends),
+                "valid": valid,
+                "accuracy": rep_accuracy
+            }
         }
 
 # --- PUBLIC API ---
@@ -143,4 +211,10 @@ def process_squat(angles, landmarks, user_profile):
     """
     Processes a squat frame ensuring depth thresholds are strictly enforced.
     """
-    return _analyzer.analyze_frame(angles, landmarks, user_profile)
\ No newline at end of file
+    return _analyzer.analyze_frame(angles, landmarks, user_profile)
+
+def analyze_sequence(angles_array, landmarks_array, user_profile):
+    """
+    Offline squat analysis of a whole angle/landmark time series in one pass.
+    """
+    return SquatAnalyzer().analyze_sequence(angles_array, landmarks_array, user_profile)
@@ -0,0 +1,284 @@
+"""
+Scheduler for one machine serving several training stations.
+
+Pose inference is the expensive step, so the scheduler treats a fixed number of
+concurrent inferences (the CPU budget) as the shared resource and decides which
+station gets the next slot. Every station runs in one of three modes:
+  active   - mid-set: a rep is in progress or one finished recently
+  ready    - a person is framed but resting
+  presence - nobody framed; only a low-rate check for someone stepping in
+Each mode has a frame-rate target and a priority. When slots are scarce, active
+stations are served first and idle ones fall back to presence checks, so CPU
+moves to the sessions that need it. A station overdue by more than one of its
+own intervals jumps to the front, so presence checks still run under full load.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import analyzers
+import landmark_filter as lf
+import landmark_math as lm
+import pose_module as pm
+import rep_clipper as rc
+
+# mode: (target fps, priority - lower runs first)
+MODE_SETTINGS = {
+    "active": (20.0, 0),
+    "ready": (10.0, 1),
+    "presence": (2.0, 2)
+}
+
+
+class ReplaySource:
+    """
+    Frames held in memory and played back in real time, like a live camera:
+    latest() always returns the frame for the current wall-clock instant.
+    """
+
+    def __init__(self, frames, fps=30.0):
+        self.frames = frames
+        self.fps = fps
+        self.start = time.perf_counter()
+
+    def latest(self):
+        index = int((time.perf_counter() - self.start) * self.fps)
+        return self.frames[index % len(self.frames)]
+
+
+class Station:
+    """One camera with its own detector, landmark filter, analyzer and statistics."""
+
+    def __init__(self, name, source, exercise, user_profile, absent_after=3.0, active_hold=4.0,
+                 delay_window=1000):
+        self.name = name
+        self.source = source
+        self.user_profile = user_profile
+        self.detector = pm.poseDetector()
+        self.analyzer = analyzers.create_analyzer(exercise)
+        self.landmark_filter = lf.LandmarkFilter(lf.required_joints_for(exercise))
+
+        self.absent_after = absent_after
+        self.active_hold = active_hold
+        self.mode = "presence"
+        self.next_due = time.perf_counter()
+        self.busy = False
+        self.last_seen = 0.0
+        self.last_rep_time = 0.0
+        self.rep_count = 0
+
+        # Scheduling statistics: delays of the most recent dispatches and the number
+        # of frames that became due but were skipped because the station ran late
+        self.delays = deque(maxlen=delay_window)
+        self.skipped_frames = 0
+        self.mode_frames = {mode: 0 for mode in MODE_SETTINGS}
+        self.mode_time = {mode: 0.0 for mode in MODE_SETTINGS}
+        self.mode_since = self.next_due
+
+    @property
+    def priority(self):
+        return MODE_SETTINGS[self.mode][1]
+
+    @property
+    def interval(self):
+        return 1.0 / MODE_SETTINGS[self.mode][0]
+
+    def overdue(self, now):
+        return max(0.0, now - self.next_due)
+
+    def _set_mode(self, mode, now):
+        if mode != self.mode:
+            self.mode_time[self.mode] += now - self.mode_since
+            self.mode_since = now
+            self.mode = mode
+
+    def step(self):
+        """Processes the latest frame and updates the station mode."""
+        img = self.source.latest()
+        self.detector.findPose(img, draw=False)
+        raw_landmarks = self.detector.getLandmarks(img)
+        now = time.perf_counter()
+        self.mode_frames[self.mode] += 1
+
+        lm_list = self.landmark_filter.process(raw_landmarks, now) if raw_landmarks else None
+        if lm_list:
+            self.last_seen = now
+            res = self.analyzer.analyze_frame(lm.get_angles(lm_list), lm_list, self.user_profile)
+            if res["rep_count"] != self.rep_count or res.get("rep_event"):
+                self.rep_count = res["rep_count"]
+                self.last_rep_time = now
+            mid_rep = res["stage"] not in rc.REST_STAGES
+            recently_active = now - self.last_rep_time < self.active_hold
+            self._set_mode("active" if mid_rep or recently_active else "ready", now)
+        elif now - self.last_seen > self.absent_after:
+            self._set_mode("presence", now)
+
+    def report(self, now):
+        mode_time = dict(self.mode_time)
+        mode_time[self.mode] += now - self.mode_since
+        # A frame still waiting counts too, so a starved station cannot report no delay
+        pending = [] if self.busy else [self.overdue(now)]
+        skipped = self.skipped_frames + (0 if self.busy else int(self.overdue(now) / self.interval))
+        delays = sorted(list(self.delays) + pending)
+        achieved = {
+            mode: round(self.mode_frames[mode] / mode_time[mode], 1)
+            for mode in MODE_SETTINGS if mode_time[mode] > 1.0
+        }
+        return {
+            "station": self.name,
+            "mode": self.mode,
+            "achieved_fps": achieved,
+            "mean_delay_ms": round(sum(delays) / len(delays) * 1000, 1) if delays else 0.0,
+            "p95_delay_ms": round(delays[int(0.95 * (len(delays) - 1))] * 1000, 1) if delays else 0.0,
+            "skipped_frames": skipped
+        }
+
+
+class StationScheduler:
+    """
+    Runs stations on a pool of `cpu_budget` worker threads.
+    A station becomes due one frame interval (for its current mode) after its
+    previous frame was due; among due stations the lowest priority value and then
+    the longest-waiting one is dispatched first, except that a station overdue by
+    more than its own interval is treated as top priority. Scheduling delay is the
+    time between a frame becoming due and it being dispatched.
+    """
+
+    def __init__(self, stations, cpu_budget=None):
+        self.stations = stations
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        self.free_slots = self.cpu_budget
+        self.cond = threading.Condition()
+        self.running = False
+
+    def _worker(self, station):
+        try:
+            station.step()
+        except Exception:
+            pass  # One failing camera must never stall the others
+        with self.cond:
+            station.busy = False
+            self.free_slots += 1
+            self.cond.notify()
+
+    def run(self, duration):
+        self.running = True
+        stop_at = time.perf_counter() + duration
+        with ThreadPoolExecutor(max_workers=self.cpu_budget) as pool, self.cond:
+            while self.running:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    break
+
+                due = [s for s in self.stations if not s.busy and s.next_due <= now]
+                # Aging: a station late by a whole interval outranks every mode
+                due.sort(key=lambda s: (0 if s.overdue(now) > s.interval else s.priority, s.next_due))
+                for station in due[:self.free_slots]:
+                    station.delays.append(station.overdue(now))
+                    station.skipped_frames += int(station.overdue(now) / station.interval)
+                    # Keep the cadence, but never queue up a burst of missed frames
+                    station.next_due = max(station.next_due + station.interval, now)
+                    station.busy = True
+                    self.free_slots -= 1
+                    pool.submit(self._worker, station)
+
+                idle = [s.next_due for s in self.stations if not s.busy]
+                wait = min(idle) - now if idle and self.free_slots else stop_at - now
+                self.cond.wait(timeout=max(0.001, min(wait, stop_at - now)))
+
+            # Let in-flight frames finish before reporting
+            while self.free_slots < self.cpu_budget:
+                self.cond.wait(timeout=1.0)
+        self.running = False
+        return self.report()
+
+    def report(self):
+        now = time.perf_counter()
+        return [station.report(now) for station in self.stations]
+
+
+# --- BENCHMARK ---
+VIDEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "videos_for_testing")
+BENCH_VIDEOS = {
+    "squats.mp4": "squats",
+    "sq2.mp4": "squats",
+    "p2.mp4": "pushups"
+}
+
+
+def _load_clip(path, limit=300):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while len(frames) < limit:
+        success, img = cap.read()
+        if not success:
+            break
+        frames.append(cv2.resize(img, (int(img.shape[1] * 720 / img.shape[0]), 720)))
+    cap.release()
+    return frames, fps
+
+
+def _build_stations(clips, count, idle):
+    """count exercising stations plus `idle` stations whose camera sees nobody."""
+    profile = {"age": 25, "bmi": 22.0}
+    stations = []
+    for i in range(count):
+        frames, fps, exercise = clips[i % len(clips)]
+        stations.append(Station(f"station-{i}", ReplaySource(frames, fps), exercise, profile))
+    blank = [np.zeros_like(clips[0][0][0])]
+    for i in range(idle):
+        stations.append(Station(f"idle-{i}", ReplaySource(blank), "squats", profile))
+    return stations
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="How many stations can one box sustain?")
+    parser.add_argument("--max-stations", type=int, default=8)
+    parser.add_argument("--idle", type=int, default=0, help="Extra stations with nobody in frame")
+    parser.add_argument("--cpu-budget", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--tolerance", type=float, default=0.9,
+                        help="Fraction of the active target fps that counts as sustained")
+    args = parser.parse_args()
+
+    clips = []
+    for name, exercise in BENCH_VIDEOS.items():
+        frames, fps = _load_clip(os.path.join(VIDEO_DIR, name))
+        if frames:
+            clips.append((frames, fps, exercise))
+    if not clips:
+        print("No frames could be decoded from the benchmark videos.")
+        return
+
+    target = MODE_SETTINGS["active"][0]
+    sustained = 0
+    print(f"{'stations':>8} {'min active fps':>15} {'p95 delay ms':>13} {'sustained':>10}")
+    for count in range(1, args.max_stations + 1):
+        scheduler = StationScheduler(_build_stations(clips, count, args.idle), args.cpu_budget)
+        reports = scheduler.run(args.duration)
+
+        exercising = [r for r in reports if r["station"].startswith("station-")]
+        # A station that never reached active mode sustained 0 fps in it
+        min_fps = min(r["achieved_fps"].get("active", 0.0) for r in exercising)
+        p95_delay = max(r["p95_delay_ms"] for r in reports)
+        ok = min_fps >= args.tolerance * target
+        print(f"{count:>8} {min_fps:>15.1f} {p95_delay:>13.1f} {'yes' if ok else 'no':>10}")
+        if ok:
+            sustained = count
+
+    print(f"One box sustains {sustained} exercising station(s) at {target:.0f} fps"
+          f" (+{args.idle} idle) with a CPU budget of {scheduler.cpu_budget}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+analyze_sequence must give the same result as feeding every frame, in order,
+to a fresh analyzer through analyze_frame.
+"""
+
+import numpy as np
+import pytest
+
+import pushup_logic
+import squat_logic
+
+PROFILE = {"age": 25, "bmi": 22.0, "fitness_level": "intermediate"}
+
+
+def _random_session(rng, n):
+    """Noisy oscillating angles plus landmarks that exercise the posture checks."""
+    t = np.arange(n)
+    angles = {
+        "knee": 90 + 70 * np.cos(t / rng.uniform(5, 30)) + rng.normal(0, 15, n),
+        "elbow": 100 + 70 * np.cos(t / rng.uniform(5, 30)) + rng.normal(0, 15, n),
+        "hip": 150 + 20 * np.sin(t / rng.uniform(3, 40)) + rng.normal(0, 5, n)
+    }
+    lms = np.zeros((n, 33, 3), dtype=int)
+    lms[:, :, 0] = np.arange(33)
+    lms[:, [11, 23, 27], 1] = 100
+    lms[:, 12, 1] = 100 + rng.integers(0, 90, n)
+    lms[:, 24, 1] = 100 + rng.integers(0, 60, n)
+    lms[:, 28, 1] = 100 + rng.integers(0, 100, n)
+    profile = {"age": int(rng.integers(10, 70)), "bmi": float(rng.uniform(18, 35)),
+               "fitness_level": "intermediate"}
+    return angles, lms, profile
+
+
+def _replay(analyzer, angles, lms, profile):
+    res = None
+    for i in range(len(lms)):
+        frame_angles = {name: float(values[i]) for name, values in angles.items()}
+        res = analyzer.analyze_frame(frame_angles, lms[i].tolist(), profile)
+    return res
+
+
+@pytest.mark.parametrize("module, analyzer_class", [
+    (squat_logic, squat_logic.SquatAnalyzer),
+    (pushup_logic, pushup_logic.PushupAnalyzer)
+])
+def test_sequence_matches_frame_by_frame(module, analyzer_class):
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        angles, lms, profile = _random_session(rng, int(rng.integers(1, 400)))
+        expected = _replay(analyzer_class(), angles, lms, profile)
+        result = module.analyze_sequence(angles, lms, profile)
+        assert (result["rep_count"], result["stage"], result["accuracy"]) == \
+            (expected["rep_count"], expected["stage"], expected["accuracy"])
+
+
+@pytest.mark.parametrize("module", [squat_logic, pushup_logic])
+def test_empty_sequence(module):
+    angles = {"knee": np.empty(0), "elbow": np.empty(0), "hip": np.empty(0)}
+    result = module.analyze_sequence(angles, np.empty((0, 33, 3)), PROFILE)
+    assert result["rep_count"] == 0
+    assert result["accuracy"] == 0.0
+    assert len(result["reps"]["end"]) == 0
@@ -0,0 +1,58 @@
+"""
+The speech queue must stay within max_queue however fast utterances arrive,
+and the most recent rep count must always be the one left to speak.
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+import pytest
+
+
+@pytest.fixture
+def voice_engine(monkeypatch):
+    # Stub TTS engine whose speech blocks until released, so the queue backs up
+    release = threading.Event()
+
+    class StubEngine:
+        def setProperty(self, name, value):
+            pass
+
+        def say(self, text):
+            pass
+
+        def runAndWait(self):
+            release.wait()
+
+        def stop(self):
+            pass
+
+    monkeypatch.setitem(sys.modules, "pyttsx3", types.SimpleNamespace(init=StubEngine))
+    monkeypatch.delitem(sys.modules, "voice_engine", raising=False)
+    yield importlib.import_module("voice_engine")
+    release.set()
+    sys.modules.pop("voice_engine", None)
+
+
+def test_queue_stays_bounded(voice_engine):
+    engine = voice_engine.VoiceEngine(max_queue=4)
+    for i in range(200):
+        engine.speak_warning(f"warning {i}")
+        engine.speak_rep_count(i + 1)
+        assert len(engine.speech_queue) <= 4
+
+    queued = list(engine.speech_queue)
+    reps = [text for category, text in queued if category == "rep"]
+    assert reps == ["200"]
+    assert engine.dropped > 0
+
+
+def test_rep_count_evicts_other_speech(voice_engine):
+    engine = voice_engine.VoiceEngine(max_queue=2)
+    for i in range(5):
+        engine.speak_motivation(f"motivation {i}")
+    engine.speak_rep_count(7)
+    assert len(engine.speech_queue) <= 2
+    assert engine.speech_queue[-1] == ("rep", "7")
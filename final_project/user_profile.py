@@ -41,6 +41,48 @@ class UserProfileManager:
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
+
+        # Table linking short clips of invalid reps to their workout session
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rep_clips (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                workout_log_id INTEGER,
+                clip_path TEXT,
+                warning TEXT,
+                start_frame INTEGER,
+                end_frame INTEGER,
+                FOREIGN KEY (workout_log_id) REFERENCES workout_logs (id)
+            )
+        ''')
+
+        # Append-only per-frame angles and analyzer outputs, grouped by session tag
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS frame_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_tag TEXT,
+                frame INTEGER,
+                timestamp REAL,
+                knee REAL,
+                hip REAL,
+                elbow REAL,
+                shoulder REAL,
+                back REAL,
+                stage TEXT,
+                rep_count INTEGER,
+                accuracy REAL,
+                warnings TEXT
+            )
+        ''')
+
+        # Links a session tag to its workout_logs row once the session is saved
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS frame_log_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                workout_log_id INTEGER,
+                session_tag TEXT,
+                FOREIGN KEY (workout_log_id) REFERENCES workout_logs (id)
+            )
+        ''')
         
         conn.commit()
         conn.close()
@@ -99,6 +141,7 @@ class UserProfileManager:
     def save_workout_session(self, user_id, exercise, reps, accuracy):
         """
         Logs a completed workout session to the database.
+        Returns the ID of the new workout_logs row.
         """
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
@@ -106,6 +149,21 @@ class UserProfileManager:
             INSERT INTO workout_logs (user_id, exercise, reps, accuracy)
             VALUES (?, ?, ?, ?)
         ''', (user_id, exercise, reps, accuracy))
+        log_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return log_id
+
+    def save_rep_clips(self, workout_log_id, clips):
+        """
+        Links recorded bad-form rep clips to a workout session row.
+        """
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO rep_clips (workout_log_id, clip_path, warning, start_frame, end_frame)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(workout_log_id, c["path"], c["warning"], c["start_frame"], c["end_frame"]) for c in clips])
         conn.commit()
         conn.close()
         return True
@@ -123,6 +181,10 @@ def save_workout_session(user_id, exercise, reps, accuracy):
     manager = UserProfileManager()
     return manager.save_workout_session(user_id, exercise, reps, accuracy)
 
+def save_rep_clips(workout_log_id, clips):
+    manager = UserProfileManager()
+    return manager.save_rep_clips(workout_log_id, clips)
+
 if __name__ == "__main__":
     # Internal test logic
     uid = setup_user()
@@ -1,20 +1,24 @@
 import pyttsx3
 import threading
 import time
+from collections import OrderedDict, deque
 
 class VoiceEngine:
     """
     Provides a non-blocking text-to-speech interface using pyttsx3 and threading.
     Implements cooldown logic to prevent overlapping or redundant audio feedback.
+    A single speech worker drains a bounded queue, and the cooldown table only keeps
+    entries that can still block a repeat, so neither grows over long sessions.
     """
 
-    def __init__(self, rate=150):
+    def __init__(self, rate=150, max_queue=4, max_tracked=64):
         # Initialize the pyttsx3 engine
         self.engine = pyttsx3.init()
         self.engine.setProperty('rate', rate)
         
-        # Dictionary to track the last timestamp of specific spoken messages
-        self.last_spoken_time = {}
+        # Last timestamp of specific spoken messages, oldest first
+        self.last_spoken_time = OrderedDict()
+        self.max_tracked = max_tracked
         
         # Cooldown settings for different feedback categories (in seconds)
         self.cooldowns = {
@@ -23,11 +27,24 @@ class VoiceEngine:
             "motivation": 15.0,
             "rep": 0.0  # Rep counts should never be skipped due to cooldown
         }
+        self.max_cooldown = max(self.cooldowns.values())
+
+        # (category, text) utterances waiting for the speech worker, never more than
+        # max_queue. Extra ones are dropped since speech that far behind the workout
+        # is no longer useful. A rep count replaces any rep count still queued, as
+        # only the latest number is worth saying, and evicts the oldest non-rep
+        # utterance when the queue is full, so the current count is never dropped
+        self.speech_queue = deque()
+        self.max_queue = max_queue
+        self.speech_ready = threading.Condition()
+        self.dropped = 0
+        self.speech_thread = threading.Thread(target=self._speech_loop, daemon=True)
+        self.speech_thread.start()
 
     def _execute_speech(self, text):
         """
-        Internal target for the thread. 
-        Initializes a local engine instance per thread to avoid COM/Global state issues.
+        Runs on the speech worker thread. 
+        Initializes a local engine instance per utterance to avoid COM/Global state issues.
         """
         try:
             # Re-initializing locally inside the thread is safer for non-blocking calls
@@ -39,9 +56,44 @@ class VoiceEngine:
         except Exception:
             pass # Suppress thread-specific errors to keep main loop running
 
+    def _speech_loop(self):
+        """Speaks queued utterances one after another on the single worker thread."""
+        while True:
+            with self.speech_ready:
+                while not self.speech_queue:
+                    self.speech_ready.wait()
+                _, text = self.speech_queue.popleft()
+            self._execute_speech(text)
+
+    def _enqueue(self, text, category):
+        """Queues an utterance without ever blocking; the latest rep count is never dropped."""
+        with self.speech_ready:
+            if category == "rep":
+                # A newer count supersedes one that has not been spoken yet
+                stale = [item for item in self.speech_queue if item[0] == "rep"]
+                for item in stale:
+                    self.speech_queue.remove(item)
+                self.dropped += len(stale)
+                if self.speech_queue and len(self.speech_queue) >= self.max_queue:
+                    self.speech_queue.popleft()
+                    self.dropped += 1
+            elif len(self.speech_queue) >= self.max_queue:
+                self.dropped += 1
+                return
+            self.speech_queue.append((category, text))
+            self.speech_ready.notify()
+
+    def _prune_cooldowns(self, current_time):
+        """Forgets messages whose longest possible cooldown has expired, then caps the table size."""
+        while self.last_spoken_time:
+            last_time = next(iter(self.last_spoken_time.values()))
+            if current_time - last_time < self.max_cooldown and len(self.last_spoken_time) <= self.max_tracked:
+                break
+            self.last_spoken_time.popitem(last=False)
+
     def _speak_non_blocking(self, text, category="default"):
         """
-        Checks cooldowns and spawns a daemon thread for speech.
+        Checks cooldowns and queues the text for the speech worker.
         """
         current_time = time.time()
         cooldown_time = self.cooldowns.get(category, self.cooldowns["default"])
@@ -51,9 +103,10 @@ class VoiceEngine:
         
         if (current_time - last_time) >= cooldown_time:
             self.last_spoken_time[text] = current_time
-            # Spawn daemon thread so it doesn't block the computer vision loop
-            speech_thread = threading.Thread(target=self._execute_speech, args=(text,), daemon=True)
-            speech_thread.start()
+            self.last_spoken_time.move_to_end(text)
+            self._prune_cooldowns(current_time)
+            # Never block the computer vision loop on speech
+            self._enqueue(text, category)
 
     def speak(self, text):
         """Standard general-purpose speech."""